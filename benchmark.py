@@ -0,0 +1,291 @@
+import argparse
+import json
+import platform
+import random
+import time
+import tracemalloc
+
+import perfect_number
+import vampire_number
+
+# Reference answers, the same of the __main__ blocks of vampire_number.py and perfect_number.py
+VAMPIRE_NUMBERS_UP_TO_125500 = [
+    1260,
+    1395,
+    1435,
+    1530,
+    1827,
+    2187,
+    6880,
+    102510,
+    104260,
+    105210,
+    105264,
+    105750,
+    108135,
+    110758,
+    115672,
+    116725,
+    117067,
+    118440,
+    120600,
+    123354,
+    124483,
+    125248,
+    125433,
+    125460,
+    125500,
+]
+PERFECT_NUMBERS_UP_TO_10000 = [6, 28, 496, 8128]
+PERFECT_ANSWERS = {33550336: True, 33550338: False}
+# Vampire numbers of every size in IDENT_SIZES, so the whole search is timed for them.
+KNOWN_VAMPIRES = {
+    4: [1260, 1395, 1435, 1530, 6880],
+    6: [115672, 145314, 284760, 568750, 815958],
+    8: [26506147, 34117920, 42386967, 78188814, 81996736],
+    10: [4859904955, 5727621640, 8206697574, 8398587384, 9147419680],
+    12: [195192131683, 283523597500, 695867313748, 815794062538, 856397196648],
+}
+
+IDENT_SIZES = [4, 6, 8, 10, 12]
+TYPICAL_AGES = list(range(1, 121))
+LARGE_PERFECT_VALUES = [33550336, 33550338, 8589869056, 137438691328, 2**60 * (2**61 - 1), 10**12 - 1]
+PERCENTILES = [50, 90, 99]
+
+
+def percentile(sorted_values, percent):
+    """Returns the percentile of the sorted values (nearest rank).
+
+    Args:
+        sorted_values (list): the sorted values.
+        percent (int|float): the percentile between 0 and 100.
+
+    Returns:
+        float: the value of the percentile.
+    """
+    if not sorted_values:
+        return 0.0
+    index = max(0, -(-len(sorted_values) * percent // 100) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def time_calls(function, args_list):
+    """Call the function with every args of the list and returns the latency statistics.
+
+    Args:
+        function (callable): the function to be timed.
+        args_list (list): a list of tuples with the args for every call.
+
+    Returns:
+        dict: calls, total, mean, percentiles and max latency in seconds, and peak memory in bytes.
+    """
+    latencies = []
+    for args in args_list:
+        start = time.perf_counter()
+        function(*args)
+        latencies.append(time.perf_counter() - start)
+    latencies.sort()
+    total = sum(latencies)
+    result = {
+        "calls": len(latencies),
+        "total_s": total,
+        "mean_s": total / len(latencies) if latencies else 0.0,
+    }
+    for percent in PERCENTILES:
+        result[f"p{percent}_s"] = percentile(latencies, percent)
+    result["max_s"] = latencies[-1] if latencies else 0.0
+    result["peak_memory_bytes"] = peak_memory(function, args_list)
+    return result
+
+
+def peak_memory(function, args_list):
+    """Returns the peak of memory allocated by the function for every call, in bytes.
+
+    The memory is measured in a separate run, because tracemalloc slows down the calls.
+
+    Args:
+        function (callable): the function to be measured.
+        args_list (list): a list of tuples with the args for every call.
+
+    Returns:
+        int: the max peak of memory of the calls.
+    """
+    peak = 0
+    tracemalloc.start()
+    try:
+        for args in args_list:
+            tracemalloc.reset_peak()
+            function(*args)
+            peak = max(peak, tracemalloc.get_traced_memory()[1])
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def random_idents(num_digits, samples, rng):
+    """Returns random idents with the given number of digits.
+
+    Args:
+        num_digits (int): the number of digits.
+        samples (int): the number of idents.
+        rng (random.Random): the random generator.
+
+    Returns:
+        list: a list of ints.
+    """
+    return [rng.randrange(10 ** (num_digits - 1), 10**num_digits) for _ in range(samples)]
+
+
+def mod_9_idents(num_digits, samples, rng):
+    """Returns random idents with the given number of digits that pass the mod 9 check
+    of the vampire numbers, so they are not rejected before the search of the fangs.
+
+    Args:
+        num_digits (int): the number of digits.
+        samples (int): the number of idents.
+        rng (random.Random): the random generator.
+
+    Returns:
+        list: a list of ints.
+    """
+    idents = []
+    while len(idents) < samples:
+        ident = rng.randrange(10 ** (num_digits - 1), 10**num_digits)
+        if ident % 9 in vampire_number.VAMPIRE_MOD_9:
+            idents.append(ident)
+    return idents
+
+
+def benchmark_vampire_number(samples, rng):
+    """Time vampire_number over idents of every size in IDENT_SIZES, with one and all fangs.
+
+    For every size there are random idents (most of them rejected by the mod 9 check),
+    idents that pass the mod 9 check and the known vampire numbers of KNOWN_VAMPIRES.
+    """
+    results = {}
+    for num_digits in IDENT_SIZES:
+        idents_by_kind = {
+            "random": random_idents(num_digits, samples, rng),
+            "mod_9": mod_9_idents(num_digits, samples, rng),
+            "vampires": KNOWN_VAMPIRES[num_digits],
+        }
+        for kind, idents in idents_by_kind.items():
+            for all_fangs in (False, True):
+                args_list = [(ident, all_fangs) for ident in idents]
+                key = f"{num_digits}_digits_{kind}_{'all_fangs' if all_fangs else 'one_fang'}"
+                results[key] = time_calls(no_table_vampire_number, args_list)
+    return results
+
+
+def no_table_vampire_number(number, all_fangs):
+    """vampire_number without the precomputed table, so the search is always timed."""
+    return vampire_number.vampire_number(number, all_fangs, use_table=False)
+
+
+def benchmark_is_perfect_number(samples):
+    """Time is_perfect_number over typical ages and large values."""
+    ages = [(age,) for age in TYPICAL_AGES] * max(1, samples // len(TYPICAL_AGES))
+    large_values = [(value,) for value in LARGE_PERFECT_VALUES]
+    return {
+        "typical_ages": time_calls(perfect_number.is_perfect_number, ages),
+        "large_values": time_calls(perfect_number.is_perfect_number, large_values),
+        "batch_typical_ages": time_calls(perfect_number.is_perfect_number_batch, [(TYPICAL_AGES,)]),
+    }
+
+
+def benchmark_combinatorics():
+    """Time the combination and permutation helpers over the digits of 8 and 10 digits idents."""
+    results = {}
+    for num_digits in (8, 10):
+        digits = [str(digit % 10) for digit in range(num_digits)]
+        results[f"combination_{num_digits}"] = time_calls(vampire_number.combination, [(digits, num_digits // 2)])
+        results[f"iter_combinations_{num_digits}"] = time_calls(
+            consume, [(vampire_number.iter_combinations(digits, num_digits // 2),)]
+        )
+        half = digits[: num_digits // 2 + 2]
+        results[f"permutation_{len(half)}"] = time_calls(vampire_number.permutation, [(half,)])
+        results[f"iter_permutations_{len(half)}"] = time_calls(
+            consume, [(vampire_number.iter_permutations(half),)]
+        )
+    return results
+
+
+def consume(iterator):
+    """Consume the iterator, so the generators could be timed."""
+    for _ in iterator:
+        pass
+
+
+def check_reference_answers():
+    """Check the answers of the hot paths against the reference answers.
+
+    Returns:
+        dict: the name of every check and True if it passed.
+    """
+    vampires = [
+        number
+        for number in range(0, VAMPIRE_NUMBERS_UP_TO_125500[-1] + 1)
+        if vampire_number.vampire_number(number, use_table=False)
+    ]
+    vampires_in_range = [
+        number for number, _ in vampire_number.vampire_numbers_in_range(0, VAMPIRE_NUMBERS_UP_TO_125500[-1])
+    ]
+    perfects = [number for number in range(10000) if perfect_number.is_perfect_number(number)]
+    perfects_batch = [
+        number for number, perfect in zip(range(10000), perfect_number.is_perfect_number_batch(range(10000))) if perfect
+    ]
+    return {
+        "vampire_number": vampires == VAMPIRE_NUMBERS_UP_TO_125500,
+        "vampire_numbers_in_range": vampires_in_range == VAMPIRE_NUMBERS_UP_TO_125500,
+        "is_perfect_number": perfects == PERFECT_NUMBERS_UP_TO_10000
+        and all(perfect_number.is_perfect_number(number) == answer for number, answer in PERFECT_ANSWERS.items()),
+        "is_perfect_number_batch": perfects_batch == PERFECT_NUMBERS_UP_TO_10000,
+    }
+
+
+def run_benchmarks(samples=20, seed=2024):
+    """Run all the benchmarks with the caches disabled.
+
+    Args:
+        samples (int, optional): the number of idents of every size. Defaults to 20.
+        seed (int, optional): the seed of the random idents. Defaults to 2024.
+
+    Returns:
+        dict: the results of the benchmarks.
+    """
+    rng = random.Random(seed)
+    vampire_cache_size = vampire_number.VAMPIRE_CACHE.maxsize
+    perfect_cache_size = perfect_number.PERFECT_CACHE.maxsize
+    vampire_number.VAMPIRE_CACHE.resize(0)
+    perfect_number.PERFECT_CACHE.resize(0)
+    try:
+        return {
+            "python": platform.python_version(),
+            "samples": samples,
+            "seed": seed,
+            "checks": check_reference_answers(),
+            "vampire_number": benchmark_vampire_number(samples, rng),
+            "is_perfect_number": benchmark_is_perfect_number(samples),
+            "combinatorics": benchmark_combinatorics(),
+        }
+    finally:
+        vampire_number.VAMPIRE_CACHE.resize(vampire_cache_size)
+        perfect_number.PERFECT_CACHE.resize(perfect_cache_size)
+
+
+if __name__ == "__main__":
+
+    def main():
+        parser = argparse.ArgumentParser(description="Benchmark of the number theory hot paths.")
+        parser.add_argument("--samples", type=int, default=20, help="idents of every size")
+        parser.add_argument("--seed", type=int, default=2024, help="seed of the random idents")
+        parser.add_argument("--output", default=None, help="json file for the results")
+        args = parser.parse_args()
+        results = run_benchmarks(args.samples, args.seed)
+        text = json.dumps(results, indent=4)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as fh:
+                fh.write(text)
+        print(text)
+
+    main()
@@ -0,0 +1,117 @@
+import threading
+from collections import OrderedDict
+
+
+class LRUCache:
+    """A bounded cache that discards the least recently used entries first.
+
+    It can be shared between threads and keeps statistics of hits, misses
+    and evictions.
+    """
+
+    def __init__(self, maxsize=10000):
+        """Initialize the cache.
+
+        Args:
+            maxsize (int, optional): the max number of entries. Defaults to 10000.
+
+        Raises:
+            TypeError: if maxsize is not an int.
+            ValueError: if maxsize < 0.
+        """
+        self._check_maxsize(maxsize)
+        self.maxsize = maxsize
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    @staticmethod
+    def _check_maxsize(maxsize):
+        if not isinstance(maxsize, int):
+            raise TypeError("maxsize must be an int.")
+        if maxsize < 0:
+            raise ValueError("maxsize must be greater or equal than 0.")
+
+    def get(self, key, default=None):
+        """Returns the value of the key and mark it as the most recently used.
+
+        Args:
+            key (hashable): the key.
+            default (any, optional): the value if the key is not in the cache. Defaults to None.
+
+        Returns:
+            any: the value of the key or default.
+        """
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            self.misses += 1
+            return default
+
+    def put(self, key, value):
+        """Save the value of the key, discarding the least recently used entries if
+        the cache is full.
+
+        Args:
+            key (hashable): the key.
+            value (any): the value.
+        """
+        with self._lock:
+            if self.maxsize == 0:
+                return
+            self._data[key] = value
+            self._data.move_to_end(key)
+            self._evict()
+
+    def resize(self, maxsize):
+        """Change the max number of entries of the cache.
+
+        Args:
+            maxsize (int): the max number of entries.
+
+        Raises:
+            TypeError: if maxsize is not an int.
+            ValueError: if maxsize < 0.
+        """
+        self._check_maxsize(maxsize)
+        with self._lock:
+            self.maxsize = maxsize
+            self._evict()
+
+    def _evict(self):
+        while len(self._data) > self.maxsize:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Remove all the entries and reset the statistics."""
+        with self._lock:
+            self._data.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def stats(self):
+        """Returns the statistics of the cache.
+
+        Returns:
+            dict: hits, misses, evictions, size and maxsize of the cache.
+        """
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+            }
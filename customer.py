@@ -1,8 +1,15 @@
 import json
+import multiprocessing
 import os
+import shutil
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
 
+from json_stream import iter_chunks, iter_json_array, write_json_array
+from name_index import PrefixIndex, TrigramIndex
 from perfect_number import is_perfect_number
-from vampire_number import vampire_number
+from vampire_number import screen_idents, vampire_number
 
 
 class Customer:
@@ -35,17 +42,39 @@ class Customer:
         self.age = age
         self.vampire = None
         self.perfect = None
+        self.vampire_future = None  # set by DiscountEvaluator while the flag is computed in background
+        self.perfect_future = None
 
-    def is_vampire(self):
-        """Returns True if the customer's identification is a vampire number."""
+    def is_vampire(self, timeout=None):
+        """Returns True if the customer's identification is a vampire number.
+
+        Args:
+            timeout (float, optional): the max seconds to wait for the background evaluation.
+                Defaults to None (wait until it's ready).
+
+        Raises:
+            TimeoutError: if the background evaluation is not ready after timeout seconds.
+        """
+        if self.vampire is None and self.vampire_future is not None:
+            self.vampire = self.vampire_future.result(timeout) or False
         if self.vampire is None:
-            self.vampire = vampire_number(self.ident)
+            self.vampire = vampire_number(self.ident) or False
         if self.vampire:
             return True
         return False
 
-    def is_perfect(self):
-        """Returns True if the customer's age is a perfect number."""
+    def is_perfect(self, timeout=None):
+        """Returns True if the customer's age is a perfect number.
+
+        Args:
+            timeout (float, optional): the max seconds to wait for the background evaluation.
+                Defaults to None (wait until it's ready).
+
+        Raises:
+            TimeoutError: if the background evaluation is not ready after timeout seconds.
+        """
+        if self.perfect is None and self.perfect_future is not None:
+            self.perfect = self.perfect_future.result(timeout)
         if self.perfect is None:
             self.perfect = is_perfect_number(self.age)
         if self.perfect:
@@ -57,75 +86,638 @@ class Customer:
         return self.age >= 18
 
 
+class DiscountEvaluator:
+    """Computes the discount flags (vampire and perfect) of the customers in background,
+    so the flags are ready when a ticket or a sale needs them.
+
+    The vampire flags are computed in a pool of processes, because the search for a long
+    ident could take minutes and a thread can't be stopped: shutdown terminates the
+    processes, so the app could exit at any moment. The perfect flags are computed in
+    threads, their check is fast.
+    """
+
+    def __init__(self, workers=2):
+        """Initialize the evaluator.
+
+        Args:
+            workers (int, optional): the number of worker threads. Defaults to 2.
+
+        Raises:
+            TypeError: if workers is not an int.
+            ValueError: if workers < 1.
+        """
+        if not isinstance(workers, int):
+            raise TypeError("workers must be an int.")
+        if workers < 1:
+            raise ValueError("workers must be a positive integer.")
+        self.workers = workers
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="discount-evaluator")
+        self.pool = None  # the processes for the vampire flags, started with the first evaluation
+
+    def evaluate(self, customer):
+        """Start the computation of the flags of the customer that are not computed yet.
+
+        Args:
+            customer (Customer): the customer.
+
+        Raises:
+            TypeError: if customer is not a Customer.
+        """
+        if not isinstance(customer, Customer):
+            raise TypeError("Customer must be an instance of Customer.")
+        if customer.vampire is None and customer.vampire_future is None:
+            customer.vampire_future = self.submit_vampire_number(customer.ident)
+        if customer.perfect is None and customer.perfect_future is None:
+            customer.perfect_future = self.executor.submit(is_perfect_number, customer.age)
+
+    def submit_vampire_number(self, ident):
+        """Start the computation of vampire_number for the ident in the pool of processes.
+
+        Args:
+            ident (str): the customer's identification.
+
+        Returns:
+            Future: the future of the answer of vampire_number.
+        """
+        if self.pool is None:
+            self.pool = multiprocessing.Pool(processes=self.workers)
+        future = Future()
+        future.set_running_or_notify_cancel()
+        self.pool.apply_async(
+            vampire_number, (ident,), callback=future.set_result, error_callback=future.set_exception
+        )
+        return future
+
+    def shutdown(self):
+        """Stop the workers, the evaluations not started are cancelled and the vampire
+        searches in progress are stopped."""
+        self.executor.shutdown(wait=False, cancel_futures=True)
+        if self.pool is not None:
+            self.pool.terminate()
+            self.pool = None
+
+
+def is_eligible(predicate, timeout):
+    """Returns the answer of a customer flag predicate waiting at most timeout seconds.
+
+    If the flag is not ready in time, the fallback is False (no discount), and the
+    evaluation continues in background for the next time.
+
+    Args:
+        predicate (callable): Customer.is_vampire or Customer.is_perfect of a customer.
+        timeout (float): the max seconds to wait.
+
+    Returns:
+        bool: the answer of the predicate, or False if it's not ready.
+    """
+    try:
+        return predicate(timeout=timeout)
+    except FutureTimeoutError:
+        return False
+
+
+def iter_journal_records(filename):
+    """Generate the records of a customers journal file. A record cut by a failed save
+    is skipped.
+
+    Args:
+        filename (str): the name of the journal file.
+
+    Yields:
+        dict: a record, {"op": "add", "customer": data}, {"op": "remove", "ident": ident} or
+            {"op": "flags", "customer": data}.
+    """
+    with open(filename, "r", encoding="utf-8") as fh:
+        for line in fh:
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                continue
+
+
+def ends_with_newline(filename):
+    """Returns True if the file is empty or its last byte is a newline, so the records
+    appended to it start in a new line."""
+    with open(filename, "rb") as fh:
+        fh.seek(0, os.SEEK_END)
+        if fh.tell() == 0:
+            return True
+        fh.seek(-1, os.SEEK_END)
+        return fh.read(1) == b"\n"
+
+
+def existing_journal_filenames(journal_filename):
+    """Returns the journal files to be replayed after customers.json, in order. The
+    journal of a compaction that didn't finish is replayed before the actual one.
+
+    Args:
+        journal_filename (str): the name of the actual journal file.
+
+    Returns:
+        list: the names of the journal files that exist.
+    """
+    filenames = [f"{journal_filename}.old", journal_filename]
+    return [filename for filename in filenames if os.path.exists(filename)]
+
+
+def replay_journal(filename, customers):
+    """Apply the records of a journal file to a CustomerManager or a CustomerStore.
+
+    Args:
+        filename (str): the name of the journal file.
+        customers (CustomerManager|CustomerStore): where the records are applied, with
+            its add_data, remove_ident and update_flags methods.
+
+    Returns:
+        int: the number of records applied.
+    """
+    num_records = 0
+    for record in iter_journal_records(filename):
+        num_records += 1
+        if record["op"] == "add":
+            customers.add_data(record["customer"])
+        elif record["op"] == "remove":
+            customers.remove_ident(record["ident"])
+        elif record["op"] == "flags":
+            customers.update_flags(record["customer"])
+    return num_records
+
+
+def flags_from_data(item, flags_version):
+    """Returns the discount flags of the saved data of a customer. The flags are used
+    only if they were computed with flags_version.
+
+    Args:
+        item (dict): the customer data.
+        flags_version (int): the actual FLAGS_VERSION.
+
+    Returns:
+        tuple: the fangs, False or None if unknown, and the perfect flag or None if unknown.
+    """
+    if item.get("flags_version") != flags_version:
+        return None, None
+    vampire = None
+    if "vampire" in item:
+        vampire = item["vampire"] or False
+    return vampire, item.get("perfect")
+
+
+def build_customer_data(full_name, ident, age, vampire, perfect, flags_version):
+    """Returns the data to be saved for a customer.
+
+    Args:
+        full_name (str): the customer's name.
+        ident (str): the customer's identification.
+        age (int): the age of the customer.
+        vampire (list|bool|None): the fangs, False or None if unknown.
+        perfect (bool|None): the perfect flag or None if unknown.
+        flags_version (int): the actual FLAGS_VERSION, saved with the known flags.
+
+    Returns:
+        dict: the customer data.
+    """
+    customer_data = {"full_name": full_name, "ident": ident, "age": age}
+    if vampire is not None or perfect is not None:
+        customer_data["flags_version"] = flags_version
+    if vampire is not None:
+        customer_data["vampire"] = vampire or None  # the fangs or null
+    if perfect is not None:
+        customer_data["perfect"] = perfect
+    return customer_data
+
+
+def write_customers_snapshot(filename, customers_data):
+    """Write the customers data in a json file. It's written in a temporary file that
+    replaces the previous one, so a failed save doesn't break it.
+
+    Args:
+        filename (str): the name of the file.
+        customers_data (iterable): the customers data (dicts).
+    """
+    tmp_filename = f"{filename}.tmp"
+    with open(tmp_filename, "w", encoding="utf-8") as fh:
+        write_json_array(fh, customers_data)
+        fh.flush()
+        os.fsync(fh.fileno())  # the journal that it replaces is removed after it
+    os.replace(tmp_filename, filename)
+
+
 class CustomerManager:
     """Manager for customers."""
 
     DATA_FILENAME = "customers.json"
+    BULK_SCREEN_THRESHOLD = 1000  # from this amount of customers the vampire flags are computed in parallel
+    SCREEN_WORKERS = None  # number of processes for the bulk screening, None for the number of CPUs
+    LOAD_CHUNK_SIZE = 10000  # number of customers records parsed before building their customers
+    FLAGS_VERSION = 1  # change it when vampire_number or is_perfect_number answers change, so the saved flags are ignored
+    JOURNAL_FILENAME = "customers.journal"
+    COMPACTION_THRESHOLD = 10000  # number of journal records that starts a compaction into a new customers.json
+
+    def __init__(self, customers=None, journal=False):
+        """Initialize the manager.
+
+        Args:
+            customers (list, optional): a list of Customer to be added. Defaults to None.
+            journal (bool, optional): if True, save_customers_data appends the adds, the removes
+                and the new discount flags to JOURNAL_FILENAME instead of writing all the
+                customers. Defaults to False.
 
-    def __init__(self, customers=None):
-        """Initialize the manager."""
+        Raises:
+            TypeError: if customers is not a list.
+        """
         if not customers:
             customers = []
         if not isinstance(customers, list):
             raise TypeError("Customers must be a list.")
-        self.customers = customers
+        self.customers = []
+        self.customers_by_ident = {}  # index of the customers by their normalized ident
+        self.names_index = None  # index of the customers by their full name, built on the first search
+        self.names_trigrams = None  # index of the customers for the fuzzy search, built on the first search
+        self.journal = journal
+        self.journal_pending = []  # records of the changes not saved yet
+        self.journal_records = 0  # records in the journal file
+        self.saved_flags = {}  # normalized ident: flags_bits of the flags in customers.json or the journal
+        self.compaction_thread = None
+        for customer in customers:
+            self.add_customer(customer)
+
+    @staticmethod
+    def normalize_ident(ident):
+        """Returns the ident as it's used in the index of customers.
+
+        Args:
+            ident (str|int): the identification.
+
+        Returns:
+            str: the normalized ident.
+        """
+        return str(ident).strip().lower()
 
     def add_customer(self, customer):
         """Add a customer to the manager."""
         if not isinstance(customer, Customer):
             raise TypeError("Customer must be an instance of Customer.")
-        for item in self.customers:
-            if item.ident.lower() == customer.ident.lower():
-                return
+        key = self.normalize_ident(customer.ident)
+        if key in self.customers_by_ident:
+            return
+        self.customers_by_ident[key] = customer
+        if self.names_index is not None:
+            self.names_index.add(customer.full_name, key, customer)
+        if self.names_trigrams is not None:
+            self.names_trigrams.add(customer.full_name, key, customer)
         self.customers.append(customer)
+        if self.journal:
+            self.journal_pending.append(("add", customer))
 
     def remove_customer(self, customer):
         """Remove a customer from the manager."""
         if not isinstance(customer, Customer):
             raise TypeError("Customer must be an instance of Customer.")
-        if customer in self.customers:
+        key = self.normalize_ident(customer.ident)
+        if self.customers_by_ident.get(key) is customer:
+            del self.customers_by_ident[key]
+            self.saved_flags.pop(key, None)
+            if self.names_index is not None:
+                self.names_index.remove(key)
+            if self.names_trigrams is not None:
+                self.names_trigrams.remove(key)
             self.customers.remove(customer)
+            if self.journal:
+                self.journal_pending.append(("remove", customer))
 
     def get_customer_by_ident(self, ident):
         """Get a customer by their identification."""
-        for customer in self.customers:
-            if customer.ident.lower() == ident.lower():
-                return customer
-        return None
+        return self.customers_by_ident.get(self.normalize_ident(ident))
+
+    def build_names_index(self):
+        """Build the index of names, the first time that a name is searched."""
+        if self.names_index is not None:
+            return
+        self.names_index = PrefixIndex()
+        self.names_index.add_many(
+            (customer.full_name, key, customer) for key, customer in self.customers_by_ident.items()
+        )
 
     def get_customer_by_name(self, name):
-        """Get a customer by their full name."""
-        for customer in self.customers:
-            if customer.full_name.lower() == name.lower():
-                return customer
-        return None
+        """Get a customer by their full name (case and accents insensitive)."""
+        self.build_names_index()
+        return self.names_index.search_exact(name)
+
+    def get_customer_by_name_start_with(self, name, page=None, page_size=20):
+        """Get customers whose full name starts with a given name (case and accents insensitive).
+
+        Args:
+            name (str): the start of the name.
+            page (int, optional): the page of results, starting at 1. Defaults to None (all the results).
+            page_size (int, optional): the number of customers of every page. Defaults to 20.
+
+        Returns:
+            list: the customers sorted by name.
+        """
+        self.build_names_index()
+        if page is None:
+            return self.names_index.search_prefix(name)
+        if not isinstance(page, int) or not isinstance(page_size, int):
+            raise TypeError("page and page_size must be ints.")
+        if page < 1 or page_size < 1:
+            raise ValueError("page and page_size must be positive integers.")
+        return self.names_index.search_prefix(name, offset=(page - 1) * page_size, limit=page_size)
 
-    def get_customer_by_name_start_with(self, name):
-        """Get customers whose full name starts with a given name."""
-        return [customer for customer in self.customers if customer.full_name.lower().startswith(name.lower())]
+    def count_customers_by_name_start_with(self, name):
+        """Returns the number of customers whose full name starts with a given name."""
+        self.build_names_index()
+        return self.names_index.count_prefix(name)
+
+    def search_customers_by_name(self, name, k=5):
+        """Get the k customers whose full name is the most similar to a given name, so
+        a misspelled name finds the customer too.
+
+        Args:
+            name (str): the name.
+            k (int, optional): the max number of customers. Defaults to 5.
+
+        Returns:
+            list: the customers, the most similar first.
+        """
+        if self.names_trigrams is None:
+            self.names_trigrams = TrigramIndex()
+            for key, customer in self.customers_by_ident.items():
+                self.names_trigrams.add(customer.full_name, key, customer)
+        return [customer for _, customer in self.names_trigrams.search(name, k)]
 
     def load_customers_data(self):
+        self.wait_compaction()
+        journal_filenames = self.journal_filenames()
+        if not os.path.exists(self.DATA_FILENAME) and not journal_filenames:
+            return
+        self.customers = []
+        self.customers_by_ident = {}
+        self.names_index = None
+        self.names_trigrams = None
+        self.saved_flags = {}
+        journal = self.journal
+        self.journal = False  # the loaded customers are not changes
+        try:
+            for customers_data in self.iter_customers_data():
+                for item in customers_data:
+                    self.add_data(item)
+            self.journal_records = 0
+            for filename in journal_filenames:
+                self.journal_records += replay_journal(filename, self)
+        finally:
+            self.journal = journal
+        self.journal_pending = []
+        if self.screen_customers() and self.journal and self.compaction_thread is None:
+            # the new flags are not changes of the journal, so they are saved in a snapshot
+            self.write_snapshot(self.customers)
+            for filename in journal_filenames:
+                os.remove(filename)
+            self.journal_records = 0
+
+    def journal_filenames(self):
+        """Returns the journal files to be replayed after customers.json, in order.
+
+        Returns:
+            list: the names of the journal files that exist.
+        """
+        return existing_journal_filenames(self.JOURNAL_FILENAME)
+
+    def add_data(self, item):
+        """Add a customer from its saved data.
+
+        Args:
+            item (dict): the customer data.
+        """
+        customer = self.customer_from_data(item)
+        self.add_customer(customer)
+        self.saved_flags[self.normalize_ident(customer.ident)] = self.flags_bits(item)
+
+    def remove_ident(self, ident):
+        """Remove the customer with an identification, if there is one.
+
+        Args:
+            ident (str): the customer's identification.
+        """
+        customer = self.get_customer_by_ident(ident)
+        if customer is not None:
+            self.remove_customer(customer)
+
+    def update_flags(self, item):
+        """Set the discount flags saved after the customer, if the customer exists.
+
+        Args:
+            item (dict): the customer data with the flags.
+        """
+        customer = self.get_customer_by_ident(item["ident"])
+        if customer is None:
+            return
+        vampire, perfect = flags_from_data(item, self.FLAGS_VERSION)
+        if vampire is not None:
+            customer.vampire = vampire
+        if perfect is not None:
+            customer.perfect = perfect
+        key = self.normalize_ident(customer.ident)
+        self.saved_flags[key] = self.saved_flags.get(key, 0) | self.flags_bits(item)
+
+    def iter_customers_data(self, chunk_size=None):
+        """Generate the saved customers records in chunks, parsing the file incrementally.
+
+        Args:
+            chunk_size (int, optional): the number of records of every chunk. Defaults to LOAD_CHUNK_SIZE.
+
+        Yields:
+            list: a chunk of customers records (dicts).
+        """
+        if chunk_size is None:
+            chunk_size = self.LOAD_CHUNK_SIZE
         if not os.path.exists(self.DATA_FILENAME):
             return
         with open(self.DATA_FILENAME, "r", encoding="utf-8") as fh:
-            customers_data = json.load(fh)
-        self.customers = []
-        for item in customers_data:
-            customer = Customer(item["full_name"], item["ident"], item["age"])
-            self.add_customer(customer)
+            yield from iter_chunks(iter_json_array(fh), chunk_size)
+
+    def customer_from_data(self, item):
+        """Returns a customer from its saved data. The saved discount flags are used if
+        they were computed with the actual FLAGS_VERSION.
+
+        Args:
+            item (dict): the customer data.
+
+        Returns:
+            Customer: the customer.
+        """
+        customer = Customer(item["full_name"], item["ident"], item["age"])
+        customer.vampire, customer.perfect = flags_from_data(item, self.FLAGS_VERSION)
+        return customer
+
+    def customer_to_data(self, customer):
+        """Returns the data to be saved for the customer, with the discount flags that
+        are already computed.
+
+        Args:
+            customer (Customer): the customer.
+
+        Returns:
+            dict: the customer data.
+        """
+        vampire = customer.vampire
+        if vampire is None and customer.vampire_future is not None and customer.vampire_future.done():
+            if not customer.vampire_future.cancelled() and customer.vampire_future.exception() is None:
+                vampire = customer.vampire_future.result() or False
+        perfect = customer.perfect
+        if perfect is None and customer.perfect_future is not None and customer.perfect_future.done():
+            if not customer.perfect_future.cancelled() and customer.perfect_future.exception() is None:
+                perfect = customer.perfect_future.result()
+        return build_customer_data(
+            customer.full_name, customer.ident, customer.age, vampire, perfect, self.FLAGS_VERSION
+        )
+
+    def flags_bits(self, customer_data):
+        """Returns the discount flags that are in the saved data of a customer. Flags
+        computed with an old FLAGS_VERSION don't count.
+
+        Args:
+            customer_data (dict): the customer data.
+
+        Returns:
+            int: 1 if the vampire flag is saved, plus 2 if the perfect flag is saved.
+        """
+        vampire, perfect = flags_from_data(customer_data, self.FLAGS_VERSION)
+        return (vampire is not None) | (perfect is not None) << 1
+
+    def screen_customers(self):
+        """Compute the vampire flag of the customers that don't have it, in parallel
+        if there are at least BULK_SCREEN_THRESHOLD of them.
+
+        Returns:
+            int: the number of customers screened, 0 if they were less than BULK_SCREEN_THRESHOLD.
+        """
+        missing = [customer for customer in self.customers if customer.vampire is None]
+        if len(missing) < self.BULK_SCREEN_THRESHOLD:
+            return 0
+        idents = (customer.ident for customer in missing)
+        for customer, fangs in zip(missing, screen_idents(idents, workers=self.SCREEN_WORKERS)):
+            customer.vampire = fangs or False
+        return len(missing)
 
     def save_customers_data(self):
-        customers_data = []
-        for customer in self.customers:
-            customer_data = {
-                "full_name": customer.full_name,
-                "ident": customer.ident,
-                "age": customer.age,
-            }
-            customers_data.append(customer_data)
-        with open(self.DATA_FILENAME, "w", encoding="utf-8") as fh:
-            json.dump(customers_data, fh, indent=4)
+        """Save the customers. In journal mode just the changes since the last save are
+        appended to the journal, and the journal is compacted into a new customers.json in
+        background when it has COMPACTION_THRESHOLD records."""
+        if not self.journal:
+            self.write_snapshot(self.customers)
+            return
+        if not os.path.exists(self.DATA_FILENAME) and self.compaction_thread is None:
+            self.write_snapshot(self.customers)
+            for filename in self.journal_filenames():
+                os.remove(filename)
+            self.journal_pending = []
+            self.journal_records = 0
+            return
+        self.append_journal()
+        if self.journal_records >= self.COMPACTION_THRESHOLD:
+            self.start_compaction()
+
+    def write_snapshot(self, customers):
+        """Write the customers in customers.json.
+
+        Args:
+            customers (list): the customers.
+        """
+        write_customers_snapshot(self.DATA_FILENAME, (self.saved_customer_data(customer) for customer in customers))
+
+    def saved_customer_data(self, customer):
+        """Returns the data to be saved for the customer, and keeps which of its flags are saved.
+
+        Args:
+            customer (Customer): the customer.
+
+        Returns:
+            dict: the customer data.
+        """
+        customer_data = self.customer_to_data(customer)
+        self.saved_flags[self.normalize_ident(customer.ident)] = self.flags_bits(customer_data)
+        return customer_data
+
+    def append_journal(self):
+        """Append the changes not saved yet to the journal file, and a flags record for
+        every customer with discount flags computed after it was saved."""
+        records = []
+        for op, customer in self.journal_pending:
+            if op == "add":
+                records.append({"op": op, "customer": self.saved_customer_data(customer)})
+            else:
+                records.append({"op": op, "ident": customer.ident})
+        for key, customer in self.customers_by_ident.items():
+            saved = self.saved_flags.get(key, 0)
+            if saved == 3:
+                continue
+            known = (customer.vampire is not None or customer.vampire_future is not None) | (
+                customer.perfect is not None or customer.perfect_future is not None
+            ) << 1
+            if not known & ~saved:
+                continue
+            customer_data = self.customer_to_data(customer)
+            if self.flags_bits(customer_data) & ~saved:
+                records.append({"op": "flags", "customer": self.saved_customer_data(customer)})
+        self.journal_pending = []
+        if not records:
+            return
+        new_line = os.path.exists(self.JOURNAL_FILENAME) and not ends_with_newline(self.JOURNAL_FILENAME)
+        with open(self.JOURNAL_FILENAME, "a", encoding="utf-8") as fh:
+            if new_line:  # after a record cut by a failed save
+                fh.write("\n")
+            for record in records:
+                fh.write(json.dumps(record, ensure_ascii=False))
+                fh.write("\n")
+            fh.flush()
+            os.fsync(fh.fileno())
+        self.journal_records += len(records)
+
+    def start_compaction(self):
+        """Fold the journal into a new customers.json in a background thread. The journal
+        is moved aside, so the next changes go to a new journal file. If the journal of a
+        compaction that didn't finish is still there, the journal is appended to it."""
+        if self.compaction_thread is not None and self.compaction_thread.is_alive():
+            return
+        self.wait_compaction()
+        old_filename = f"{self.JOURNAL_FILENAME}.old"
+        if os.path.exists(self.JOURNAL_FILENAME) and os.path.exists(old_filename):
+            new_line = not ends_with_newline(old_filename)
+            with open(old_filename, "a", encoding="utf-8") as dst:
+                if new_line:
+                    dst.write("\n")
+                with open(self.JOURNAL_FILENAME, "r", encoding="utf-8") as src:
+                    shutil.copyfileobj(src, dst)
+                dst.flush()
+                os.fsync(dst.fileno())
+            os.remove(self.JOURNAL_FILENAME)
+        elif os.path.exists(self.JOURNAL_FILENAME):
+            os.replace(self.JOURNAL_FILENAME, old_filename)
+        self.journal_records = 0
+        customers = list(self.customers)  # the customers when the journal was moved aside
+        self.compaction_thread = threading.Thread(
+            target=self.compact, args=(customers,), name="customers-compaction"
+        )
+        self.compaction_thread.start()
+
+    def compact(self, customers):
+        """Write the new customers.json and remove the journal that it replaces.
+
+        Args:
+            customers (list): the customers.
+        """
+        self.write_snapshot(customers)
+        if os.path.exists(f"{self.JOURNAL_FILENAME}.old"):
+            os.remove(f"{self.JOURNAL_FILENAME}.old")
+
+    def wait_compaction(self):
+        """Wait until the compaction in progress (if any) is finished."""
+        if self.compaction_thread is not None:
+            self.compaction_thread.join()
+            self.compaction_thread = None
 
     def del_data_file(self):
-        if os.path.exists(self.DATA_FILENAME):
-            os.remove(self.DATA_FILENAME)
+        self.wait_compaction()
+        for filename in [self.DATA_FILENAME] + self.journal_filenames():
+            if os.path.exists(filename):
+                os.remove(filename)
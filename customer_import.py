@@ -0,0 +1,211 @@
+import csv
+import json
+import os
+import time
+from itertools import chain, islice, tee
+
+from customer import Customer, CustomerManager
+from json_stream import iter_chunks
+from perfect_number import is_perfect_number_batch
+from vampire_number import screen_idents
+
+IMPORT_CHUNK_SIZE = 10000  # number of customers added to the manager at once
+MAX_AGE = 150
+MAX_REPORTED_ERRORS = 100  # the errors after this amount are counted but not listed
+FIELDS = ("full_name", "ident", "age")
+
+
+def iter_records(filename):
+    """Generate the records of a csv (with a full_name,ident,age header) or jsonl file,
+    reading it line by line.
+
+    Args:
+        filename (str): the name of the file, .csv or .jsonl.
+
+    Raises:
+        ValueError: if the extension of the file is not .csv or .jsonl.
+        ValueError: if the csv file has not the needed columns or it's not a valid csv.
+
+    Yields:
+        tuple: (line number, dict with the record or None if the line is not valid json).
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension not in (".csv", ".jsonl"):
+        raise ValueError("The file must be a .csv or a .jsonl file.")
+    with open(filename, "r", encoding="utf-8", newline="") as fh:
+        if extension == ".csv":
+            reader = csv.DictReader(fh)
+            if reader.fieldnames is None or not set(FIELDS) <= set(reader.fieldnames):
+                raise ValueError(f"The csv file must have the columns {', '.join(FIELDS)}.")
+            try:
+                for record in reader:
+                    yield reader.line_num, record
+            except csv.Error as error:  # for example a quote that is never closed
+                raise ValueError(f"Invalid csv file after line {reader.line_num}: {error}") from error
+            return
+        for line_num, line in enumerate(fh, start=1):
+            if not line.strip():
+                continue
+            try:
+                yield line_num, json.loads(line)
+            except json.JSONDecodeError:
+                yield line_num, None
+
+
+def validate_record(record):
+    """Returns the customer data of a record, converting the values read as text.
+
+    Args:
+        record (dict): the record with full_name, ident and age.
+
+    Raises:
+        ValueError: if the record is not valid.
+
+    Returns:
+        tuple: (full_name, ident, age).
+    """
+    if not isinstance(record, dict):
+        raise ValueError("Invalid record.")
+    full_name = record.get("full_name")
+    if not isinstance(full_name, str) or not full_name.strip():
+        raise ValueError("Invalid full_name.")
+    ident = record.get("ident")
+    if not isinstance(ident, (str, int)) or isinstance(ident, bool):
+        raise ValueError("Invalid ident.")
+    ident = str(ident).strip()
+    if not ident.isdigit():
+        raise ValueError("Invalid ident.")
+    age = record.get("age")
+    if isinstance(age, str) and age.strip().isdigit():
+        age = int(age)
+    if not isinstance(age, int) or isinstance(age, bool) or not 0 <= age <= MAX_AGE:
+        raise ValueError("Invalid age.")
+    return " ".join(full_name.split()), ident, age
+
+
+class CustomerImporter:
+    """Imports customers from a csv or jsonl file into a CustomerManager (or a CustomerStore).
+
+    The file is streamed, the records are validated and deduplicated against the
+    customers already registered, the vampire flags are computed by a process pool
+    (just in this process for less than CustomerManager.BULK_SCREEN_THRESHOLD new
+    customers) and the perfect flags by a single sieve for every chunk, and the
+    customers are added in chunks of chunk_size.
+    """
+
+    def __init__(self, customer_manager, chunk_size=IMPORT_CHUNK_SIZE, workers=None):
+        """Initialize the importer.
+
+        Args:
+            customer_manager (CustomerManager): the manager where the customers are added.
+            chunk_size (int, optional): the number of customers added at once. Defaults to IMPORT_CHUNK_SIZE.
+            workers (int, optional): the number of processes for the vampire flags.
+                Defaults to CustomerManager.SCREEN_WORKERS.
+
+        Raises:
+            TypeError: if chunk_size is not an int.
+            ValueError: if chunk_size < 1.
+        """
+        if not isinstance(chunk_size, int):
+            raise TypeError("chunk_size must be an int.")
+        if chunk_size < 1:
+            raise ValueError("chunk_size must be a positive integer.")
+        self.customer_manager = customer_manager
+        self.chunk_size = chunk_size
+        self.workers = CustomerManager.SCREEN_WORKERS if workers is None else workers
+        self.reset_report()
+
+    def reset_report(self):
+        self.report = {
+            "filename": None,
+            "read": 0,
+            "imported": 0,
+            "duplicates": 0,
+            "invalid": 0,
+            "errors": [],
+            "elapsed_s": 0.0,
+            "records_per_s": 0.0,
+        }
+
+    def add_error(self, line_num, message):
+        self.report["invalid"] += 1
+        if len(self.report["errors"]) < MAX_REPORTED_ERRORS:
+            self.report["errors"].append({"line": line_num, "error": message})
+
+    def iter_new_customers_data(self, filename):
+        """Generate the valid records of the file whose ident is not registered yet.
+
+        Args:
+            filename (str): the name of the file.
+
+        Yields:
+            tuple: (full_name, ident, age).
+        """
+        seen = set()  # the idents of the file, so the duplicates inside the file are skipped too
+        for line_num, record in iter_records(filename):
+            self.report["read"] += 1
+            try:
+                full_name, ident, age = validate_record(record)
+            except ValueError as error:
+                self.add_error(line_num, str(error))
+                continue
+            key = CustomerManager.normalize_ident(ident)
+            if key in seen or self.customer_manager.get_customer_by_ident(ident) is not None:
+                self.report["duplicates"] += 1
+                continue
+            seen.add(key)
+            yield full_name, ident, age
+
+    def import_file(self, filename):
+        """Import the customers of the file.
+
+        Args:
+            filename (str): the name of the .csv or .jsonl file.
+
+        Raises:
+            ValueError: if the file is not a .csv or .jsonl file, a csv without the needed columns
+                or a invalid csv (the chunks of customers already added are kept).
+            FileNotFoundError: if the file doesn't exist.
+
+        Returns:
+            dict: the report of the import, with the number of records read, imported,
+                duplicated and invalid, the first errors, and the throughput.
+        """
+        self.reset_report()
+        self.report["filename"] = filename
+        start = time.perf_counter()
+        new_customers_data = self.iter_new_customers_data(filename)
+        # the process pool is only started for a file with enough new customers
+        first_customers_data = list(islice(new_customers_data, CustomerManager.BULK_SCREEN_THRESHOLD))
+        workers = self.workers if len(first_customers_data) >= CustomerManager.BULK_SCREEN_THRESHOLD else 1
+        customers_data, for_idents = tee(chain(first_customers_data, new_customers_data))
+        fangs = screen_idents((ident for _, ident, _ in for_idents), workers=workers)
+        for chunk in iter_chunks(zip(customers_data, fangs), self.chunk_size):
+            perfects = is_perfect_number_batch(age for (_, _, age), _ in chunk)
+            for ((full_name, ident, age), vampire), perfect in zip(chunk, perfects):
+                customer = Customer(full_name, ident, age)
+                customer.vampire = vampire or False
+                customer.perfect = perfect
+                self.customer_manager.add_customer(customer)
+            self.report["imported"] += len(chunk)
+        elapsed = time.perf_counter() - start
+        self.report["elapsed_s"] = elapsed
+        self.report["records_per_s"] = self.report["read"] / elapsed if elapsed else 0.0
+        return self.report
+
+
+if __name__ == "__main__":
+    import sys
+
+    def main():
+        if len(sys.argv) < 2:
+            print("Use: python customer_import.py <file.csv|file.jsonl> [workers]")
+            return
+        workers = int(sys.argv[2]) if len(sys.argv) > 2 else None
+        customer_manager = CustomerManager()
+        customer_manager.load_customers_data()
+        report = CustomerImporter(customer_manager, workers=workers).import_file(sys.argv[1])
+        customer_manager.save_customers_data()
+        print(json.dumps(report, indent=4))
+
+    main()
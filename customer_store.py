@@ -0,0 +1,522 @@
+import os
+from array import array
+
+from customer import (
+    Customer,
+    CustomerManager,
+    build_customer_data,
+    existing_journal_filenames,
+    flags_from_data,
+    replay_journal,
+    write_customers_snapshot,
+)
+from json_stream import iter_chunks, iter_json_array
+from name_index import PrefixIndex, TrigramIndex
+from vampire_number import screen_idents
+
+
+class CustomerView(Customer):
+    """A customer whose data lives in a CustomerStore row. The views are created on
+    demand and two views of the same row are equal."""
+
+    def __init__(self, store, row):
+        """Initialize the view.
+
+        Args:
+            store (CustomerStore): the store.
+            row (int): the row of the customer in the store.
+        """
+        self.store = store
+        self.row = row
+
+    def __eq__(self, other):
+        if isinstance(other, CustomerView):
+            return self.store is other.store and self.row == other.row
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((id(self.store), self.row))
+
+    def __repr__(self):
+        return f"CustomerView({self.full_name!r}, {self.ident!r}, {self.age})"
+
+    @property
+    def full_name(self):
+        return self.store.name_at(self.row)
+
+    @property
+    def ident(self):
+        return self.store.ident_at(self.row)
+
+    @property
+    def age(self):
+        return self.store.ages[self.row]
+
+    @property
+    def vampire(self):
+        return self.store.get_vampire(self.row)
+
+    @vampire.setter
+    def vampire(self, value):
+        self.store.set_vampire(self.row, value)
+
+    @property
+    def perfect(self):
+        return self.store.get_perfect(self.row)
+
+    @perfect.setter
+    def perfect(self, value):
+        self.store.set_perfect(self.row, value)
+
+    @property
+    def vampire_future(self):
+        return self.store.futures.get((self.row, "vampire"))
+
+    @vampire_future.setter
+    def vampire_future(self, future):
+        self.store.set_future(self.row, "vampire", future)
+
+    @property
+    def perfect_future(self):
+        return self.store.futures.get((self.row, "perfect"))
+
+    @perfect_future.setter
+    def perfect_future(self, future):
+        self.store.set_future(self.row, "perfect", future)
+
+
+class CustomerStore:
+    """Columnar store of customers with the same API of CustomerManager.
+
+    Every customer is a row of parallel arrays (ident, ident length, age, name
+    offset and length, flags) and all the names live in a single utf-8 buffer,
+    so a customer costs a few bytes instead of a full Customer object. The
+    Customer objects are CustomerView created on demand.
+    """
+
+    DATA_FILENAME = CustomerManager.DATA_FILENAME
+    JOURNAL_FILENAME = CustomerManager.JOURNAL_FILENAME
+    FLAGS_VERSION = CustomerManager.FLAGS_VERSION
+    LOAD_CHUNK_SIZE = CustomerManager.LOAD_CHUNK_SIZE
+    BULK_SCREEN_THRESHOLD = CustomerManager.BULK_SCREEN_THRESHOLD
+    SCREEN_WORKERS = CustomerManager.SCREEN_WORKERS
+    MAX_IDENT_DIGITS = 19  # the idents are saved in unsigned 64 bits ints
+
+    # bits of the flags array
+    VAMPIRE_KNOWN = 1
+    VAMPIRE = 2
+    PERFECT_KNOWN = 4
+    PERFECT = 8
+    DELETED = 16
+
+    def __init__(self, customers=None):
+        """Initialize the store.
+
+        Args:
+            customers (list, optional): a list of Customer to be added. Defaults to None.
+
+        Raises:
+            TypeError: if customers is not a list.
+        """
+        if not customers:
+            customers = []
+        if not isinstance(customers, list):
+            raise TypeError("Customers must be a list.")
+        self.clear()
+        for customer in customers:
+            self.add_customer(customer)
+
+    def clear(self):
+        """Remove all the customers of the store."""
+        self.idents = array("Q")
+        self.ident_lengths = array("B")
+        self.ages = array("i")
+        self.name_offsets = array("Q")
+        self.name_lengths = array("I")
+        self.flags = array("B")
+        self.names = bytearray()
+        self.fangs = {}  # row: fangs, just for the vampire customers
+        self.futures = {}  # (row, flag): future of a background evaluation
+        self.rows_by_ident = {}  # normalized ident: row
+        self.names_index = None  # built the first time a name is searched
+        self.names_trigrams = None  # built the first time a name is searched by similarity
+
+    def __len__(self):
+        return len(self.rows_by_ident)
+
+    def rows(self):
+        """Generate the rows of the customers not deleted."""
+        deleted = self.DELETED
+        for row, flags in enumerate(self.flags):
+            if not flags & deleted:
+                yield row
+
+    @property
+    def customers(self):
+        """The list of customers (views), in the order they were added."""
+        return [CustomerView(self, row) for row in self.rows()]
+
+    def name_at(self, row):
+        """Returns the full name of the customer of the row.
+
+        Args:
+            row (int): the row.
+
+        Returns:
+            str: the full name.
+        """
+        start = self.name_offsets[row]
+        return self.names[start : start + self.name_lengths[row]].decode("utf-8")
+
+    def ident_at(self, row):
+        """Returns the identification of the customer of the row, with its leading zeros.
+
+        Args:
+            row (int): the row.
+
+        Returns:
+            str: the identification.
+        """
+        return str(self.idents[row]).zfill(self.ident_lengths[row])
+
+    def get_vampire(self, row):
+        """Returns the vampire flag of the customer of the row.
+
+        Args:
+            row (int): the row.
+
+        Returns:
+            list|bool|None: the fangs, False if it's not a vampire number or None if unknown.
+        """
+        flags = self.flags[row]
+        if not flags & self.VAMPIRE_KNOWN:
+            return None
+        if flags & self.VAMPIRE:
+            return self.fangs[row]
+        return False
+
+    def set_vampire(self, row, value):
+        """Set the vampire flag of the customer of the row.
+
+        Args:
+            row (int): the row.
+            value (list|bool|None): the fangs, False if it's not a vampire number or None if unknown.
+        """
+        flags = self.flags[row] & ~(self.VAMPIRE_KNOWN | self.VAMPIRE)
+        self.fangs.pop(row, None)
+        if value is not None:
+            flags |= self.VAMPIRE_KNOWN
+            if value:
+                flags |= self.VAMPIRE
+                self.fangs[row] = value
+        self.flags[row] = flags
+
+    def get_perfect(self, row):
+        """Returns the perfect flag of the customer of the row.
+
+        Args:
+            row (int): the row.
+
+        Returns:
+            bool|None: True if the age is a perfect number, or None if unknown.
+        """
+        flags = self.flags[row]
+        if not flags & self.PERFECT_KNOWN:
+            return None
+        return bool(flags & self.PERFECT)
+
+    def set_perfect(self, row, value):
+        """Set the perfect flag of the customer of the row.
+
+        Args:
+            row (int): the row.
+            value (bool|None): True if the age is a perfect number, or None if unknown.
+        """
+        flags = self.flags[row] & ~(self.PERFECT_KNOWN | self.PERFECT)
+        if value is not None:
+            flags |= self.PERFECT_KNOWN
+            if value:
+                flags |= self.PERFECT
+        self.flags[row] = flags
+
+    def set_future(self, row, flag, future):
+        """Set the future of a flag computed in background for the customer of the row.
+
+        Args:
+            row (int): the row.
+            flag (str): "vampire" or "perfect".
+            future (Future|None): the future, or None when the evaluation is finished.
+        """
+        if future is None:
+            self.futures.pop((row, flag), None)
+        else:
+            self.futures[(row, flag)] = future
+
+    def add(self, full_name, ident, age, vampire=None, perfect=None):
+        """Add a customer to the store, if there is not another customer with the same ident.
+
+        Args:
+            full_name (str): the customer's name.
+            ident (str|int): the customer's identification.
+            age (int): the age of the customer.
+            vampire (list|bool|None, optional): the fangs, False or None if unknown. Defaults to None.
+            perfect (bool|None, optional): the perfect flag or None if unknown. Defaults to None.
+
+        Raises:
+            TypeError: if full_name is not a str.
+            TypeError: if ident is not a int or a str.
+            ValueError: if ident has not digits characters or too many digits.
+            TypeError: if age is not an int.
+
+        Returns:
+            CustomerView|None: the added customer, or None if the ident already exists.
+        """
+        if not isinstance(full_name, str):
+            raise TypeError("Full name must be a str.")
+        if not isinstance(ident, (str, int)):
+            raise TypeError("Invalid ident")
+        ident = str(ident).strip()
+        if not ident.isdigit():
+            raise ValueError("Invalid ident")
+        if len(ident) > self.MAX_IDENT_DIGITS:
+            raise ValueError(f"The ident can't have more than {self.MAX_IDENT_DIGITS} digits.")
+        if not isinstance(age, int):
+            raise TypeError("Age must be an int.")
+        key = CustomerManager.normalize_ident(ident)
+        if key in self.rows_by_ident:
+            return None
+        row = len(self.flags)
+        name = full_name.encode("utf-8")
+        self.idents.append(int(ident))
+        self.ident_lengths.append(len(ident))
+        self.ages.append(age)
+        self.name_offsets.append(len(self.names))
+        self.name_lengths.append(len(name))
+        self.names += name
+        self.flags.append(0)
+        self.set_vampire(row, vampire)
+        self.set_perfect(row, perfect)
+        self.rows_by_ident[key] = row
+        if self.names_index is not None:
+            self.names_index.add(full_name, key, row)
+        if self.names_trigrams is not None:
+            self.names_trigrams.add(full_name, key, row)
+        return CustomerView(self, row)
+
+    def add_customer(self, customer):
+        """Add a customer to the store."""
+        if not isinstance(customer, Customer):
+            raise TypeError("Customer must be an instance of Customer.")
+        self.add(customer.full_name, customer.ident, customer.age, customer.vampire, customer.perfect)
+
+    def remove_customer(self, customer):
+        """Remove a customer from the store. Its row is marked as deleted and keeps its space in
+        the arrays, so the rows of the views already created don't change, but it's not saved."""
+        if not isinstance(customer, Customer):
+            raise TypeError("Customer must be an instance of Customer.")
+        key = CustomerManager.normalize_ident(customer.ident)
+        row = self.rows_by_ident.pop(key, None)
+        if row is None:
+            return
+        self.flags[row] |= self.DELETED
+        self.fangs.pop(row, None)
+        self.futures.pop((row, "vampire"), None)
+        self.futures.pop((row, "perfect"), None)
+        if self.names_index is not None:
+            self.names_index.remove(key)
+        if self.names_trigrams is not None:
+            self.names_trigrams.remove(key)
+
+    def get_customer_by_ident(self, ident):
+        """Get a customer by their identification."""
+        row = self.rows_by_ident.get(CustomerManager.normalize_ident(ident))
+        if row is None:
+            return None
+        return CustomerView(self, row)
+
+    def build_names_index(self):
+        """Build the index of names, the first time that a name is searched."""
+        if self.names_index is not None:
+            return
+        self.names_index = PrefixIndex()
+        self.names_index.add_many(
+            (self.name_at(row), CustomerManager.normalize_ident(self.ident_at(row)), row) for row in self.rows()
+        )
+
+    def get_customer_by_name(self, name):
+        """Get a customer by their full name (case and accents insensitive)."""
+        self.build_names_index()
+        row = self.names_index.search_exact(name)
+        if row is None:
+            return None
+        return CustomerView(self, row)
+
+    def get_customer_by_name_start_with(self, name, page=None, page_size=20):
+        """Get customers whose full name starts with a given name (case and accents insensitive).
+
+        Args:
+            name (str): the start of the name.
+            page (int, optional): the page of results, starting at 1. Defaults to None (all the results).
+            page_size (int, optional): the number of customers of every page. Defaults to 20.
+
+        Returns:
+            list: the customers sorted by name.
+        """
+        self.build_names_index()
+        if page is None:
+            rows = self.names_index.search_prefix(name)
+        else:
+            if not isinstance(page, int) or not isinstance(page_size, int):
+                raise TypeError("page and page_size must be ints.")
+            if page < 1 or page_size < 1:
+                raise ValueError("page and page_size must be positive integers.")
+            rows = self.names_index.search_prefix(name, offset=(page - 1) * page_size, limit=page_size)
+        return [CustomerView(self, row) for row in rows]
+
+    def count_customers_by_name_start_with(self, name):
+        """Returns the number of customers whose full name starts with a given name."""
+        self.build_names_index()
+        return self.names_index.count_prefix(name)
+
+    def search_customers_by_name(self, name, k=5):
+        """Get the k customers whose full name is the most similar to a given name.
+
+        Args:
+            name (str): the name, it could be misspelled.
+            k (int, optional): the max number of customers. Defaults to 5.
+
+        Returns:
+            list: the customers, the most similar first.
+        """
+        if self.names_trigrams is None:
+            self.names_trigrams = TrigramIndex()
+            for row in self.rows():
+                self.names_trigrams.add(self.name_at(row), CustomerManager.normalize_ident(self.ident_at(row)), row)
+        return [CustomerView(self, row) for _, row in self.names_trigrams.search(name, k)]
+
+    def count_by_age(self, min_age=0, max_age=None):
+        """Returns the number of customers with min_age <= age <= max_age, scanning the ages array.
+
+        Args:
+            min_age (int, optional): the min age. Defaults to 0.
+            max_age (int, optional): the max age. Defaults to None (no max).
+
+        Returns:
+            int: the number of customers.
+        """
+        if max_age is None:
+            max_age = max(self.ages, default=0)
+        deleted = self.DELETED
+        return sum(
+            1 for age, flags in zip(self.ages, self.flags) if min_age <= age <= max_age and not flags & deleted
+        )
+
+    def count_flag(self, flag):
+        """Returns the number of customers with the flag bit set (VAMPIRE, PERFECT, ...).
+
+        Args:
+            flag (int): the flag bit.
+
+        Returns:
+            int: the number of customers.
+        """
+        deleted = self.DELETED
+        return sum(1 for flags in self.flags if flags & flag and not flags & deleted)
+
+    def load_customers_data(self):
+        """Load the customers of customers.json and replay the journal files written by a
+        CustomerManager in journal mode."""
+        journal_filenames = self.journal_filenames()
+        if not os.path.exists(self.DATA_FILENAME) and not journal_filenames:
+            return
+        self.clear()
+        if os.path.exists(self.DATA_FILENAME):
+            with open(self.DATA_FILENAME, "r", encoding="utf-8") as fh:
+                for customers_data in iter_chunks(iter_json_array(fh), self.LOAD_CHUNK_SIZE):
+                    for item in customers_data:
+                        self.add_data(item)
+        for filename in journal_filenames:
+            replay_journal(filename, self)
+        self.screen_customers()
+
+    def journal_filenames(self):
+        """Returns the journal files to be replayed after customers.json, in order.
+
+        Returns:
+            list: the names of the journal files that exist.
+        """
+        return existing_journal_filenames(self.JOURNAL_FILENAME)
+
+    def add_data(self, item):
+        """Add a customer from its saved data. The saved discount flags are used if
+        they were computed with the actual FLAGS_VERSION.
+
+        Args:
+            item (dict): the customer data.
+        """
+        vampire, perfect = flags_from_data(item, self.FLAGS_VERSION)
+        self.add(item["full_name"], item["ident"], item["age"], vampire, perfect)
+
+    def remove_ident(self, ident):
+        """Remove the customer with an identification, if there is one.
+
+        Args:
+            ident (str): the customer's identification.
+        """
+        customer = self.get_customer_by_ident(ident)
+        if customer is not None:
+            self.remove_customer(customer)
+
+    def update_flags(self, item):
+        """Set the discount flags saved after the customer, if the customer exists.
+
+        Args:
+            item (dict): the customer data with the flags.
+        """
+        row = self.rows_by_ident.get(CustomerManager.normalize_ident(item["ident"]))
+        if row is None:
+            return
+        vampire, perfect = flags_from_data(item, self.FLAGS_VERSION)
+        if vampire is not None:
+            self.set_vampire(row, vampire)
+        if perfect is not None:
+            self.set_perfect(row, perfect)
+
+    def screen_customers(self):
+        """Compute the vampire flag of the customers that don't have it, in parallel
+        if there are at least BULK_SCREEN_THRESHOLD of them."""
+        missing = [row for row in self.rows() if not self.flags[row] & self.VAMPIRE_KNOWN]
+        if len(missing) < self.BULK_SCREEN_THRESHOLD:
+            return
+        idents = (self.ident_at(row) for row in missing)
+        for row, fangs in zip(missing, screen_idents(idents, workers=self.SCREEN_WORKERS)):
+            self.set_vampire(row, fangs or False)
+
+    def save_customers_data(self):
+        """Save all the customers in customers.json, the journal files are already included."""
+        write_customers_snapshot(self.DATA_FILENAME, (self.customer_to_data(row) for row in self.rows()))
+        for filename in self.journal_filenames():
+            os.remove(filename)
+
+    def customer_to_data(self, row):
+        """Returns the data to be saved for the customer of the row.
+
+        Args:
+            row (int): the row.
+
+        Returns:
+            dict: the customer data.
+        """
+        return build_customer_data(
+            self.name_at(row),
+            self.ident_at(row),
+            self.ages[row],
+            self.get_vampire(row),
+            self.get_perfect(row),
+            self.FLAGS_VERSION,
+        )
+
+    def del_data_file(self):
+        for filename in [self.DATA_FILENAME] + self.journal_filenames():
+            if os.path.exists(filename):
+                os.remove(filename)
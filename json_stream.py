@@ -0,0 +1,120 @@
+import json
+
+READ_SIZE = 1 << 16
+
+
+def iter_json_array(fh, read_size=READ_SIZE):
+    """Generate the items of a json array from a file, reading it by blocks, so
+    the whole file is never in memory.
+
+    Args:
+        fh (file): a text file opened for reading, with a json array.
+        read_size (int, optional): the number of characters of every read. Defaults to READ_SIZE.
+
+    Raises:
+        ValueError: if the file is not a valid json array.
+
+    Yields:
+        any: the items of the array.
+    """
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    expected = "["  # "[", "item or ]" (after "["), "item" (after ","), ", or ]" (after an item) or "end"
+
+    while True:
+        while pos < len(buffer) and buffer[pos].isspace():
+            pos += 1
+        if pos == len(buffer):
+            if eof:
+                if expected == "end":
+                    return
+                raise ValueError("Unexpected end of the json array.")
+            data = fh.read(read_size)
+            eof = not data
+            buffer = buffer[pos:] + data
+            pos = 0
+            continue
+        char = buffer[pos]
+        if expected == "end":
+            raise ValueError("Invalid json array, there is data after the array.")
+        if expected == "[":
+            if char != "[":
+                raise ValueError("The file is not a json array.")
+            expected = "item or ]"
+            pos += 1
+            continue
+        if expected == ", or ]":
+            if char not in ",]":
+                raise ValueError("Invalid json array, expected , or ].")
+            expected = "item" if char == "," else "end"
+            pos += 1
+            continue
+        if char == "]" and expected == "item or ]":
+            expected = "end"
+            pos += 1
+            continue
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise ValueError("Invalid json array.")
+            item, end = None, None  # the item is not complete, read more
+        if end is not None:
+            # the item is only complete if a separator follows it, else a number or
+            # a literal cut by the end of the block could be read as a shorter item.
+            next_pos = end
+            while next_pos < len(buffer) and buffer[next_pos].isspace():
+                next_pos += 1
+            if next_pos < len(buffer) and buffer[next_pos] in ",]":
+                pos = end
+                expected = ", or ]"
+                yield item
+                continue
+            if eof:
+                raise ValueError("Invalid json array, expected , or ].")
+        data = fh.read(read_size)
+        eof = not data
+        buffer = buffer[pos:] + data
+        pos = 0
+
+
+def iter_chunks(items, chunk_size):
+    """Generate lists of chunk_size items (the last one could be shorter).
+
+    Args:
+        items (iterable): the items.
+        chunk_size (int): the number of items of every chunk.
+
+    Yields:
+        list: a chunk of items.
+    """
+    chunk = []
+    for item in items:
+        chunk.append(item)
+        if len(chunk) == chunk_size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def write_json_array(fh, items):
+    """Write the items as a json array, one item per line, without building the
+    whole text in memory.
+
+    Args:
+        fh (file): a text file opened for writing.
+        items (iterable): the items to be written.
+    """
+    fh.write("[")
+    first = True
+    for item in items:
+        if first:
+            fh.write("\n")
+            first = False
+        else:
+            fh.write(",\n")
+        fh.write(json.dumps(item, ensure_ascii=False))
+    fh.write("\n]\n")
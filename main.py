@@ -8,8 +8,10 @@ from rich.table import Table
 from rich.text import Text
 
 from constant import PANEL_OPTIONS, USER_ACCESS_BY_TYPE
-from customer import Customer, CustomerManager
+from customer import Customer, CustomerManager, DiscountEvaluator
+from customer_import import CustomerImporter
 from match_and_team import MatchManager, TeamManager
+from occupancy import SEAT_OCCUPANCY
 from restaurant import Product, RestaurantManager
 from sale import SaleManager
 from stadium import Stadium, StadiumManager
@@ -26,7 +28,8 @@ class InterfaceManager:
         self.user_manager = UserManager()
         self.restaurant_manager = RestaurantManager()
         self.match_manager = MatchManager()
-        self.customer_manager = CustomerManager()
+        self.customer_manager = CustomerManager(journal=True)
+        self.discount_evaluator = DiscountEvaluator()
         self.ticket_manager = TicketManager()
         self.products_sold = []
         self.team_manager = TeamManager()
@@ -157,8 +160,8 @@ class InterfaceManager:
                 if key != "s":
                     menu_text.append("\n")
             if self.user is None:
-                temp_user = self.user_manager.users[0]
-                if len(self.user_manager.users) == 1:
+                temp_user = next(iter(self.user_manager.users_by_id.values()))
+                if len(self.user_manager.users_by_id) == 1:
                     if temp_user.user_id == "admin123" and temp_user.password == "password123":
                         menu_text.append("\n")
                         menu_text.append(Text("Usuario por defecto admin123 password123\n"))
@@ -210,6 +213,7 @@ class InterfaceManager:
             elif choice == "s":
                 self.console.print(Text("Hasta Luego...", style="blue"))
                 prompt("Presione cualquier tecla para terminar...")
+                self.discount_evaluator.shutdown()
                 break
 
     def login(self):
@@ -463,6 +467,7 @@ class InterfaceManager:
                 "1": "Agregar Cliente",
                 "2": "Listar Clientes",
                 "3": "Eliminar Cliente",
+                "4": "Importar Clientes",
                 "s": "Salir",
             }
             for key, value in menu_options.items():
@@ -481,6 +486,9 @@ class InterfaceManager:
             elif choice == "3":
                 self.remove_customer()
                 continue
+            elif choice == "4":
+                self.import_customers()
+                continue
             elif choice == "s":
                 break
 
@@ -513,6 +521,7 @@ class InterfaceManager:
         if prompt(text, choices=["s", "n"]) == "s":
             customer = Customer(full_name=name, ident=ident, age=age)
             self.customer_manager.add_customer(customer)
+            self.discount_evaluator.evaluate(customer)
             text = "[green]Cliente agregado con éxito!!![/green]"
             self.console.print(Text.from_markup(text))
             text = "Presione enter para continuar..."
@@ -581,6 +590,36 @@ class InterfaceManager:
             text = "Presione enter para continuar..."
             prompt(text)
 
+    def import_customers(self):
+        os.system("cls")
+        title = "Importar Clientes"
+        panel_text = Text()
+        panel = self.get_panel(panel_text, title=title, panel_option_key="customers")
+        self.console.print(panel)
+        text = "Archivo .csv o .jsonl con las columnas full_name, ident, age"
+        filename = prompt(text)
+        try:
+            report = CustomerImporter(self.customer_manager).import_file(filename)
+        except (OSError, ValueError) as error:
+            self.console.print(Text(f"No se pudo importar el archivo: {error}", style="red"))
+            prompt("Presione enter para continuar...")
+            return
+        panel_text.append(Text.from_markup(f"Leídos: [blue]{report['read']}[/blue]\n"))
+        panel_text.append(Text.from_markup(f"Importados: [green]{report['imported']}[/green]\n"))
+        panel_text.append(Text.from_markup(f"Duplicados: [yellow]{report['duplicates']}[/yellow]\n"))
+        panel_text.append(Text.from_markup(f"Inválidos: [red]{report['invalid']}[/red]\n"))
+        panel_text.append(
+            Text.from_markup(
+                f"Tiempo: [blue]{report['elapsed_s']:.2f}[/blue] s, [blue]{report['records_per_s']:.0f}[/blue] registros/s"
+            )
+        )
+        for error in report["errors"]:
+            panel_text.append(Text(f"\nLínea {error['line']}: {error['error']}", style="red"))
+        os.system("cls")
+        panel = self.get_panel(panel_text, title=title, panel_option_key="customers")
+        self.console.print(panel)
+        prompt("Presione enter para continuar...")
+
     def ticket_sales_menu(self):
         while True:
             os.system("cls")
@@ -649,6 +688,7 @@ class InterfaceManager:
         self.console.print(panel)
         customer = self.customer_manager.get_customer_by_ident(ident)
         if customer:
+            self.discount_evaluator.evaluate(customer)
             panel_text = f"Nombre: [blue]{customer.full_name}[/blue] "
             panel_text = f"Ident: [blue]{customer.ident}[/blue] "
             panel_text += f"Edad: [blue]{customer.age}[/blue]"
@@ -1133,7 +1173,7 @@ class InterfaceManager:
                 prompt("Presione enter para continuar...")
                 continue
             self.selected_seat = seats[int(seat_num) - 1]
-            if self.selected_seat.is_sold(self.selected_match):
+            if SEAT_OCCUPANCY.is_sold(self.selected_match, self.selected_seat.index()):
                 text = "[red]El asiento está vendido!!![/red]"
                 self.console.print(text)
                 prompt("Presione enter para continuar...")
@@ -1155,7 +1195,8 @@ class InterfaceManager:
             self.console.print(text)
             prompt("Presione enter para continuar...")
             return
-        if self.selected_seat.is_sold(self.selected_match):
+        seat_index = self.selected_seat.index()
+        if SEAT_OCCUPANCY.is_sold(self.selected_match, seat_index):
             text = "[red]El asiento está vendido!!![/red]"
             self.console.print(text)
             prompt("Presione enter para continuar...")
@@ -1174,13 +1215,24 @@ class InterfaceManager:
         panel = Panel(table, title=title, subtitle=subtitle_text, subtitle_align="right", height=None, width=90)
         os.system("cls")
         self.console.print(panel)
+        if ticket.discount_timed_out:
+            text = "[yellow]La verificación del descuento no terminó a tiempo, "
+            text += "la entrada no tiene descuento.[/yellow]"
+            self.console.print(text)
+            text = "¿Desea esperar la verificación del descuento?"
+            if prompt(text, choices=["s", "n"]) == "s":
+                ticket.decide_discount()
+                table = ticket.show_ticket_table_form()
+                panel = Panel(table, title=title, subtitle=subtitle_text, subtitle_align="right", height=None, width=90)
+                os.system("cls")
+                self.console.print(panel)
         text = "¿Desea comprar la entrada?"
         if prompt(text, choices=["s", "n"]) == "n":
             text = "[red]La entrada no fue comprada!!![/red]"
             self.console.print(text)
             prompt("Presione enter para continuar...")
             return
-        self.selected_seat.sold(self.selected_match)
+        SEAT_OCCUPANCY.sold(self.selected_match, seat_index)
         self.ticket_manager.add_ticket(ticket)
         text = "La entrada se ha comprado con éxito.\n"
         self.console.print(text)
@@ -3,6 +3,7 @@ import os
 from datetime import date, datetime
 
 from euro_2024_api_handler import Euro2024ApiHandler
+from name_index import TrigramIndex
 from stadium import Stadium
 
 
@@ -51,6 +52,7 @@ class TeamManager:
         if not isinstance(teams, list):
             raise TypeError("teams must be a list.")
         self.teams = teams
+        self.names_trigrams = None  # index of the teams for the fuzzy search by name, built on the first search
         self.api_handler = Euro2024ApiHandler()
 
     def add_team(self, team):
@@ -58,12 +60,16 @@ class TeamManager:
         if not isinstance(team, Team):
             raise TypeError("team must be a Team.")
         self.teams.append(team)
+        if self.names_trigrams is not None:
+            self.names_trigrams.add(team.name, team.id, team)
 
     def remove_team(self, team):
         """Remove a team from the manager."""
         if not isinstance(team, Team):
             raise TypeError("team must be a Team.")
         self.teams.remove(team)
+        if self.names_trigrams is not None:
+            self.names_trigrams.remove(team.id)
 
     def get_team_by_id(self, id):
         """Get a team by its id."""
@@ -83,6 +89,24 @@ class TeamManager:
                 return team
         return None
 
+    def search_teams_by_name(self, name, k=5):
+        """Get the k teams whose name is the most similar to a given name.
+
+        Args:
+            name (str): the name, it could be misspelled.
+            k (int, optional): the max number of teams. Defaults to 5.
+
+        Returns:
+            list: the teams, the most similar first.
+        """
+        if not isinstance(name, str):
+            raise TypeError("name must be a str.")
+        if self.names_trigrams is None:
+            self.names_trigrams = TrigramIndex()
+            for team in self.teams:
+                self.names_trigrams.add(team.name, team.id, team)
+        return [team for _, team in self.names_trigrams.search(name, k)]
+
     def get_team_by_code(self, code):
         """Get a team by its code."""
         if not isinstance(code, str):
@@ -0,0 +1,266 @@
+import heapq
+import math
+import unicodedata
+from bisect import bisect_left, insort
+
+
+def normalize_name(name):
+    """Returns the name without accents, in lower case and with single spaces, so
+    the names could be compared without caring of case and accents.
+
+    Args:
+        name (str): the name.
+
+    Returns:
+        str: the normalized name.
+    """
+    decomposed = unicodedata.normalize("NFKD", name)
+    without_accents = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return " ".join(without_accents.casefold().split())
+
+
+class PrefixIndex:
+    """Sorted index of names to find the items whose name starts with a prefix.
+
+    The entries are kept sorted by (normalized name, key), so a prefix query is
+    a binary search plus the matching entries.
+    """
+
+    MAX_CHAR = "\U0010ffff"
+
+    def __init__(self):
+        self.entries = []  # sorted list of (normalized name, key)
+        self.items = {}  # key: item
+        self.names = {}  # key: normalized name
+
+    def __len__(self):
+        return len(self.entries)
+
+    def add(self, name, key, item):
+        """Add an item to the index, replacing the item with the same key.
+
+        Args:
+            name (str): the name of the item.
+            key (str): a unique key of the item.
+            item (any): the item.
+        """
+        self.remove(key)
+        normalized = normalize_name(name)
+        self.items[key] = item
+        self.names[key] = normalized
+        insort(self.entries, (normalized, key))
+
+    def add_many(self, entries):
+        """Add many items to the index sorting the entries once, so building the index
+        is O(n log n) instead of a insort for every item.
+
+        Args:
+            entries (iterable): tuples (name, key, item).
+        """
+        new_entries = {}  # key: (normalized name, item), the last one of every key is kept
+        for name, key, item in entries:
+            new_entries[key] = (normalize_name(name), item)
+        for key in new_entries:
+            self.remove(key)
+        for key, (normalized, item) in new_entries.items():
+            self.items[key] = item
+            self.names[key] = normalized
+            self.entries.append((normalized, key))
+        self.entries.sort()
+
+    def remove(self, key):
+        """Remove the item with the given key from the index.
+
+        Args:
+            key (str): the key of the item.
+        """
+        if key not in self.items:
+            return
+        entry = (self.names.pop(key), key)
+        del self.items[key]
+        i = bisect_left(self.entries, entry)
+        if i < len(self.entries) and self.entries[i] == entry:
+            del self.entries[i]
+
+    def clear(self):
+        """Remove all the items of the index."""
+        self.entries = []
+        self.items = {}
+        self.names = {}
+
+    def prefix_range(self, prefix):
+        """Returns the first and the last + 1 positions of the entries starting with the prefix.
+
+        Args:
+            prefix (str): the prefix (it's normalized).
+
+        Returns:
+            tuple: (start, end) positions of the entries.
+        """
+        prefix = normalize_name(prefix)
+        start = bisect_left(self.entries, (prefix,))
+        end = bisect_left(self.entries, (prefix + self.MAX_CHAR,), lo=start)
+        return start, end
+
+    def count_prefix(self, prefix):
+        """Returns the number of items whose name starts with the prefix.
+
+        Args:
+            prefix (str): the prefix.
+
+        Returns:
+            int: the number of items.
+        """
+        start, end = self.prefix_range(prefix)
+        return end - start
+
+    def search_prefix(self, prefix, offset=0, limit=None):
+        """Returns the items whose name starts with the prefix, sorted by name.
+
+        Args:
+            prefix (str): the prefix.
+            offset (int, optional): the number of matches to skip. Defaults to 0.
+            limit (int, optional): the max number of items. Defaults to None (all).
+
+        Returns:
+            list: the items.
+        """
+        start, end = self.prefix_range(prefix)
+        start = min(start + offset, end)
+        if limit is not None:
+            end = min(end, start + limit)
+        return [self.items[key] for _, key in self.entries[start:end]]
+
+    def search_exact(self, name):
+        """Returns the first item (by key) with the given name, or None.
+
+        Args:
+            name (str): the name.
+
+        Returns:
+            any: the item or None.
+        """
+        name = normalize_name(name)
+        i = bisect_left(self.entries, (name,))
+        if i < len(self.entries) and self.entries[i][0] == name:
+            return self.items[self.entries[i][1]]
+        return None
+
+
+def trigrams(name):
+    """Returns the set of trigrams of the normalized name. Every word is padded with
+    two spaces at the start and one at the end, so the short words have trigrams too.
+
+    Args:
+        name (str): the name.
+
+    Returns:
+        set: the trigrams.
+    """
+    result = set()
+    for word in normalize_name(name).split():
+        padded = f"  {word} "
+        for i in range(len(padded) - 2):
+            result.add(padded[i : i + 3])
+    return result
+
+
+class TrigramIndex:
+    """Inverted index of the trigrams of names to find the items with a similar name,
+    even if the name is misspelled.
+
+    A search only visits the items that share one of the rarest trigrams of the query,
+    and ranks them by the similarity (Jaccard) of their sets of trigrams. An item with
+    a similarity of at least min_similarity shares at least ceil(min_similarity * q) of
+    the q trigrams of the query, so it shares one of the q - ceil(min_similarity * q) + 1
+    rarest ones. The trigrams that are in more than COMMON_FRACTION of the items (like
+    "  a") are not visited either, they are only used to compute the similarity.
+    """
+
+    COMMON_FRACTION = 0.05
+    COMMON_MIN_ITEMS = 1000  # in smaller indexes every trigram could be visited
+
+    def __init__(self):
+        self.postings = {}  # trigram: set of keys
+        self.items = {}  # key: item
+        self.trigrams = {}  # key: trigrams of the name
+
+    def __len__(self):
+        return len(self.items)
+
+    def add(self, name, key, item):
+        """Add an item to the index, replacing the item with the same key.
+
+        Args:
+            name (str): the name of the item.
+            key (str): a unique key of the item.
+            item (any): the item.
+        """
+        self.remove(key)
+        name_trigrams = trigrams(name)
+        self.items[key] = item
+        self.trigrams[key] = name_trigrams
+        for trigram in name_trigrams:
+            self.postings.setdefault(trigram, set()).add(key)
+
+    def remove(self, key):
+        """Remove the item with the given key from the index.
+
+        Args:
+            key (str): the key of the item.
+        """
+        if key not in self.items:
+            return
+        del self.items[key]
+        for trigram in self.trigrams.pop(key):
+            keys = self.postings[trigram]
+            keys.discard(key)
+            if not keys:
+                del self.postings[trigram]
+
+    def clear(self):
+        """Remove all the items of the index."""
+        self.postings = {}
+        self.items = {}
+        self.trigrams = {}
+
+    def search(self, name, k=5, min_similarity=0.2):
+        """Returns the k items with the most similar name, the most similar first.
+
+        Args:
+            name (str): the name to search, it could be misspelled.
+            k (int, optional): the max number of items. Defaults to 5.
+            min_similarity (float, optional): the min similarity (0 to 1) of the items. Defaults to 0.2.
+
+        Raises:
+            TypeError: if k is not an int.
+            ValueError: if k < 1.
+
+        Returns:
+            list: tuples (similarity, item).
+        """
+        if not isinstance(k, int):
+            raise TypeError("k must be an int.")
+        if k < 1:
+            raise ValueError("k must be a positive integer.")
+        query = trigrams(name)
+        found = sorted((len(self.postings[trigram]), trigram) for trigram in query if trigram in self.postings)
+        if not found:
+            return []
+        min_shared = max(1, math.ceil(min_similarity * len(query)))
+        common = max(self.COMMON_MIN_ITEMS, len(self.items) * self.COMMON_FRACTION)
+        probes = [trigram for size, trigram in found[: len(query) - min_shared + 1] if size <= common]
+        if not probes:
+            probes = [found[0][1]]  # the query has only common trigrams, the rarest is visited
+        candidates = set()
+        for trigram in probes:
+            candidates.update(self.postings[trigram])
+        scores = []
+        for key in candidates:
+            key_trigrams = self.trigrams[key]
+            count = len(query & key_trigrams)
+            similarity = count / (len(query) + len(key_trigrams) - count)
+            if similarity >= min_similarity:
+                scores.append((similarity, key))
+        best = heapq.nlargest(k, scores)
+        return [(similarity, self.items[key]) for similarity, key in best]
@@ -0,0 +1,181 @@
+class SeatOccupancy:
+    """Bitmap of the sold seats of a stadium in a match, indexed by the dense seat
+    number of the stadium (Seat.index)."""
+
+    def __init__(self, num_seats):
+        """Initialize the bitmap with all the seats free.
+
+        Args:
+            num_seats (int): the number of seats of the stadium.
+
+        Raises:
+            TypeError: if num_seats is not an int.
+            ValueError: if num_seats < 0.
+        """
+        if not isinstance(num_seats, int):
+            raise TypeError("num_seats must be an int.")
+        if num_seats < 0:
+            raise ValueError("num_seats must be greater or equal than 0.")
+        self.num_seats = num_seats
+        self.bits = bytearray((num_seats + 7) // 8)
+        self.num_sold = 0
+
+    def __len__(self):
+        return self.num_seats
+
+    def _check_index(self, index):
+        if not isinstance(index, int):
+            raise TypeError("index must be an int.")
+        if index < 0 or index >= self.num_seats:
+            raise ValueError(f"index must be between 0 and {self.num_seats - 1}.")
+
+    def set(self, index):
+        """Mark the seat as sold.
+
+        Args:
+            index (int): the seat index.
+        """
+        self._check_index(index)
+        mask = 1 << (index & 7)
+        if not self.bits[index >> 3] & mask:
+            self.bits[index >> 3] |= mask
+            self.num_sold += 1
+
+    def test(self, index):
+        """Returns True if the seat is sold.
+
+        Args:
+            index (int): the seat index.
+
+        Returns:
+            bool: True if the seat is sold.
+        """
+        self._check_index(index)
+        return bool(self.bits[index >> 3] & (1 << (index & 7)))
+
+    def clear(self, index):
+        """Mark the seat as free.
+
+        Args:
+            index (int): the seat index.
+        """
+        self._check_index(index)
+        mask = 1 << (index & 7)
+        if self.bits[index >> 3] & mask:
+            self.bits[index >> 3] &= ~mask
+            self.num_sold -= 1
+
+    def count(self):
+        """Returns the number of sold seats, counting the bits of the bitmap.
+
+        Returns:
+            int: the number of sold seats.
+        """
+        return int.from_bytes(self.bits, "little").bit_count()
+
+    def iter_free(self):
+        """Generate the indexes of the free seats, skipping the full bytes.
+
+        Yields:
+            int: the index of a free seat.
+        """
+        for byte_index, byte in enumerate(self.bits):
+            if byte == 0xFF:
+                continue
+            start = byte_index << 3
+            for bit in range(min(8, self.num_seats - start)):
+                if not byte & (1 << bit):
+                    yield start + bit
+
+
+class OccupancyStore:
+    """The seats occupancy of every (stadium, match). The bitmaps are created the
+    first time a seat of the match is sold."""
+
+    def __init__(self):
+        self.occupancies = {}  # (stadium id, match id): SeatOccupancy
+
+    def get(self, stadium, match):
+        """Returns the occupancy of the stadium in the match, or None if no seat was sold.
+
+        Args:
+            stadium (Stadium): the stadium.
+            match (Match): the match.
+
+        Returns:
+            SeatOccupancy|None: the occupancy.
+        """
+        return self.occupancies.get((stadium.id, match.id))
+
+    def occupancy(self, stadium, match):
+        """Returns the occupancy of the stadium in the match, creating it if needed.
+
+        Args:
+            stadium (Stadium): the stadium.
+            match (Match): the match.
+
+        Returns:
+            SeatOccupancy: the occupancy.
+        """
+        key = (stadium.id, match.id)
+        occupancy = self.occupancies.get(key)
+        if occupancy is None:
+            occupancy = SeatOccupancy(stadium.capacity)
+            self.occupancies[key] = occupancy
+        return occupancy
+
+    def is_sold(self, match, index):
+        """Returns True if the seat is sold for the match, in the stadium of the match.
+
+        Args:
+            match (Match): the match.
+            index (int): the seat index.
+
+        Returns:
+            bool: True if the seat is sold.
+        """
+        occupancy = self.get(match.stadium, match)
+        if occupancy is None:
+            return False
+        return occupancy.test(index)
+
+    def sold(self, match, index):
+        """Mark the seat as sold for the match.
+
+        Args:
+            match (Match): the match.
+            index (int): the seat index.
+        """
+        self.occupancy(match.stadium, match).set(index)
+
+    def del_sold(self, match, index):
+        """Mark the seat as free for the match.
+
+        Args:
+            match (Match): the match.
+            index (int): the seat index.
+        """
+        occupancy = self.get(match.stadium, match)
+        if occupancy is not None:
+            occupancy.clear(index)
+
+    def num_sold(self, match):
+        """Returns the number of seats sold for the match.
+
+        Args:
+            match (Match): the match.
+
+        Returns:
+            int: the number of sold seats.
+        """
+        occupancy = self.get(match.stadium, match)
+        if occupancy is None:
+            return 0
+        return occupancy.num_sold
+
+    def clear(self):
+        """Remove all the occupancies."""
+        self.occupancies = {}
+
+
+SEAT_OCCUPANCY = OccupancyStore()
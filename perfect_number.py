@@ -1,15 +1,37 @@
-def dividers(number):
-    """Return a list of dividers for the given number.
+import math
+
+from cache import LRUCache
+
+try:
+    import numpy as np
+except ImportError:  # numpy is optional, the sieve is computed with lists without it.
+    np = None
+
+# Answers of is_perfect_number shared by all the callers of the process.
+PERFECT_CACHE = LRUCache(maxsize=100000)
+# The values greater than this are not included in the sieve of is_perfect_number_batch,
+# the sieve with lists (without numpy) is much slower, so its limit is lower.
+SIEVE_LIMIT = 10**7 if np is not None else 10**5
+# The sieve is only computed if its size is at most this many times the number of values
+# that use it, else checking the values one by one is cheaper.
+SIEVE_DENSITY = 64
+# The odd numbers greater than this are not searched for dividers, there are no
+# known odd perfect numbers (and none below 10^1500), so they are not perfect.
+DIVISOR_SEARCH_LIMIT = 10**12
+
+
+def validate_number(number):
+    """Returns the number as an int.
 
     Args:
-        number (int|str): the number to get the dividers.
+        number (int|str): the number.
 
     Raises:
         TypeError: if the number is not a str or int.
         ValueError: if the str is not a number.
 
     Returns:
-        list: the list of dividers
+        int: the number.
     """
     if not isinstance(number, (int, str)):
         raise TypeError("Invalid number")
@@ -17,18 +39,133 @@ def dividers(number):
         if not number.isdigit():
             raise ValueError("Invalid number")
         number = int(number)
-    divider_list = []
-    for i in range(1, number):
+    return number
+
+
+def dividers(number):
+    """Return a list of dividers for the given number.
+
+    The dividers are found in pairs (i, number // i) up to the square root of the number.
+
+    Args:
+        number (int|str): the number to get the dividers.
+
+    Raises:
+        TypeError: if the number is not a str or int.
+        ValueError: if the str is not a number.
+
+    Returns:
+        list: the sorted list of dividers
+    """
+    number = validate_number(number)
+    if number <= 1:
+        return []
+    small_dividers = []
+    large_dividers = []
+    for i in range(1, math.isqrt(number) + 1):
+        if number % i == 0:
+            small_dividers.append(i)
+            pair = number // i
+            if pair != i and pair != number:
+                large_dividers.append(pair)
+    large_dividers.reverse()
+    return small_dividers + large_dividers
+
+
+def dividers_sum(number):
+    """Return the sum of the dividers of the number (without the number itself).
+
+    Args:
+        number (int|str): the number to get the sum of dividers.
+
+    Raises:
+        TypeError: if the number is not a str or int.
+        ValueError: if the str is not a number.
+
+    Returns:
+        int: the sum of the dividers.
+    """
+    number = validate_number(number)
+    if number <= 1:
+        return 0
+    total = 1
+    root = math.isqrt(number)
+    for i in range(2, root + 1):
+        if number % i == 0:
+            total += i
+            pair = number // i
+            if pair != i:
+                total += pair
+    return total
+
+
+def is_prime(number):
+    """Return True if the number is prime.
+
+    Args:
+        number (int): the number to check.
+
+    Returns:
+        bool: True if the number is prime.
+    """
+    if number < 2:
+        return False
+    if number % 2 == 0:
+        return number == 2
+    for i in range(3, math.isqrt(number) + 1, 2):
         if number % i == 0:
-            divider_list.append(i)
-    return divider_list
+            return False
+    return True
+
+
+def lucas_lehmer(p):
+    """Return True if the Mersenne number 2^p - 1 is prime, using the Lucas–Lehmer test.
+
+    Args:
+        p (int): a prime exponent.
+
+    Returns:
+        bool: True if 2^p - 1 is prime.
+    """
+    if p == 2:
+        return True
+    mersenne = (1 << p) - 1
+    s = 4
+    for _ in range(p - 2):
+        s = (s * s - 2) % mersenne
+    return s == 0
+
+
+def is_even_perfect_number(number):
+    """Return True if the even number is perfect.
 
+    By the Euclid–Euler theorem every even perfect number is 2^(p-1) * (2^p - 1)
+    where 2^p - 1 is prime, so the form is read directly from the bits of the number.
 
-def is_perfect_number(number):
+    Args:
+        number (int): an even positive number.
+
+    Returns:
+        bool: True if the number is perfect.
+    """
+    p = (number & -number).bit_length()  # number = 2^(p-1) * odd_part
+    odd_part = number >> (p - 1)
+    if odd_part != (1 << p) - 1:
+        return False
+    return is_prime(p) and lucas_lehmer(p)
+
+
+def is_perfect_number(number, divider_search_limit=None):
     """Return True if the number is a perfect number.
 
+    The even numbers are checked by their form 2^(p-1) * (2^p - 1) and the Lucas–Lehmer
+    test, so the cost is polylogarithmic in the number. The odd numbers are checked
+    searching their dividers, up to divider_search_limit.
+
     Args:
         number (int|str): the number to check.
+        divider_search_limit (int, optional): the odd numbers greater than this are not
+            perfect without searching their dividers. Defaults to DIVISOR_SEARCH_LIMIT.
 
     Raises:
         TypeError: if the number is not a str or int.
@@ -37,18 +174,81 @@ def is_perfect_number(number):
     Returns:
         bool: True if the number is a perfect number.
     """
-    if not isinstance(number, (int, str)):
-        raise TypeError("Invalid number")
-    if isinstance(number, str):
-        if not number.isdigit():
-            raise ValueError("Invalid number")
-        number = int(number)
+    number = validate_number(number)
+    if divider_search_limit is None:
+        divider_search_limit = DIVISOR_SEARCH_LIMIT
     if number <= 0:
         return False
-    divider_list = dividers(number)
-    if sum(divider_list) == number:
-        return True
-    return False
+    answer = PERFECT_CACHE.get(number)
+    if answer is None:
+        if number % 2 == 0:
+            answer = is_even_perfect_number(number)
+        elif number > divider_search_limit:
+            answer = False
+        else:
+            answer = dividers_sum(number) == number
+        PERFECT_CACHE.put(number, answer)
+    return answer
+
+
+def dividers_sum_sieve(max_value):
+    """Return the sum of the dividers (without the number itself) of every number up to max_value.
+
+    Args:
+        max_value (int): the greatest number of the sieve.
+
+    Returns:
+        numpy.ndarray|list: the sums of dividers indexed by number.
+    """
+    if np is not None:
+        sums = np.zeros(max_value + 1, dtype=np.int64)
+        for divider in range(1, max_value // 2 + 1):
+            sums[2 * divider :: divider] += divider
+        return sums
+    sums = [0] * (max_value + 1)
+    for divider in range(1, max_value // 2 + 1):
+        for multiple in range(2 * divider, max_value + 1, divider):
+            sums[multiple] += divider
+    return sums
+
+
+def is_perfect_number_batch(values):
+    """Return for every value if it's a perfect number, using a single sieve of the
+    sums of dividers up to the greatest value.
+
+    The values greater than SIEVE_LIMIT are checked one by one with is_perfect_number.
+    If the sieve would be larger than SIEVE_DENSITY times the number of values, all
+    the values are checked one by one.
+
+    Args:
+        values (iterable): the numbers (int|str) to check.
+
+    Raises:
+        TypeError: if any number is not a str or int.
+        ValueError: if any str is not a number.
+
+    Returns:
+        list: a list of bools, True if the value in the same position is a perfect number.
+    """
+    numbers = [validate_number(value) for value in values]
+    in_sieve = [number for number in numbers if 0 < number <= SIEVE_LIMIT]
+    if not in_sieve or max(in_sieve) > SIEVE_DENSITY * len(in_sieve):
+        return [is_perfect_number(number) for number in numbers]
+    sums = dividers_sum_sieve(max(in_sieve))
+    if np is not None:
+        sieve_numbers = np.array(in_sieve, dtype=np.int64)
+        sieve_answers = iter((sums[sieve_numbers] == sieve_numbers).tolist())
+    else:
+        sieve_answers = iter([sums[number] == number for number in in_sieve])
+    answers = []
+    for number in numbers:
+        if number <= 0:
+            answers.append(False)
+        elif number <= SIEVE_LIMIT:
+            answers.append(next(sieve_answers))
+        else:
+            answers.append(is_perfect_number(number))
+    return answers
 
 
 if __name__ == "__main__":
@@ -5,17 +5,20 @@ from rich import box
 from rich.table import Table
 from rich.text import Text
 
+import stadium_layout
 from euro_2024_api_handler import Euro2024ApiHandler
+from occupancy import SEAT_OCCUPANCY
 from tools import center_text
 
 
 class Seat:
     """Class that represents a seat in a row of a section in the stadium.
 
+    The sold seats of every match are kept in SEAT_OCCUPANCY, indexed by Seat.index.
+
     Raises:
         TypeError: if the type is not a str.
         ValueError: if the type is invalid.
-        TypeError: if the sold is not a bool.
 
     Returns:
         Seat: a seat object.
@@ -27,9 +30,9 @@ class Seat:
         "vip": "bold gold3",
         "sold": "bold red",
     }
-    NUM_SEAT_CODE_CHARACTERS = 8
+    NUM_SEAT_CODE_CHARACTERS = stadium_layout.SEAT_CODE_SIZE
 
-    def __init__(self, floor, section, row, number, type, sold_in_matches=None):
+    def __init__(self, floor, section, row, number, type):
         """The constructor
 
         Args:
@@ -38,7 +41,6 @@ class Seat:
             row (int): the row number.
             number (int): the seat number.
             type (str): the seat type.
-            sold_in_matches (list): Matches
 
         Raises:
             TypeError: if floor is not an int.
@@ -47,7 +49,6 @@ class Seat:
             TypeError: if number is not an int.
             TypeError: if type is not a str.
             ValueError: if type is invalid.
-            TypeError: if sold is not a list.
         """
         if not isinstance(floor, int):
             raise TypeError("piso must be a int.")
@@ -67,11 +68,6 @@ class Seat:
         if type not in self.SEAT_TYPES:
             raise ValueError("Invalid seat type.")
         self.type = type
-        if not sold_in_matches:
-            sold_in_matches = []
-        if not isinstance(sold_in_matches, list):
-            raise TypeError("sold_in_matches must be a list.")
-        self.sold_in_matches = sold_in_matches
 
     def color(self, match=None):
         """Returns the color of the seat.
@@ -82,7 +78,7 @@ class Seat:
         Returns:
             str: The color of the seat.
         """
-        if match and self.sold_in_matches and match in self.sold_in_matches:
+        if match and SEAT_OCCUPANCY.is_sold(match, self.index()):
             return self.SEAT_COLORS["sold"]
         return self.SEAT_COLORS[self.type]
 
@@ -106,23 +102,20 @@ class Seat:
         self.type = "general"
 
     def sold(self, match):
-        """The seat has been sold for the match, so the match should be append
-        to the sold_in_matches list.
+        """The seat has been sold for the match.
 
         Args:
             match (Match): the match where the seat has been sold.
         """
-        if match not in self.sold_in_matches:
-            self.sold_in_matches.append(match)
+        SEAT_OCCUPANCY.sold(match, self.index())
 
     def del_sold(self, match):
-        """Remove the match from the sold_in_matches list.
+        """The seat is not sold anymore for the match.
 
         Args:
             match (Match): The match to be deleted.
         """
-        if match in self.sold_in_matches:
-            self.sold_in_matches.remove(match)
+        SEAT_OCCUPANCY.del_sold(match, self.index())
 
     def is_sold(self, match):
         """Check if the seat has been sold for the match.
@@ -133,9 +126,15 @@ class Seat:
         Returns:
             bool: True if the seat has been sold for the match and False otherwise.
         """
-        if match in self.sold_in_matches:
-            return True
-        return False
+        return SEAT_OCCUPANCY.is_sold(match, self.index())
+
+    def index(self):
+        """Returns the dense number of the seat in the stadium, from 0 to capacity - 1.
+
+        Returns:
+            int: the index of the seat.
+        """
+        return stadium_layout.seat_index(self.floor, self.section, self.row, self.number)
 
     def code(self):
         """Returns the code or name of the seat.
@@ -143,22 +142,7 @@ class Seat:
         Returns:
             str: the code or name of the seat.
         """
-        text = "P"
-        if self.floor < 10:
-            text += f"0{self.floor}"
-        else:
-            text += f"{self.floor}"
-        text += self.section.upper()
-        if self.row < 10:
-            text += f"0{self.row}"
-        else:
-            text += f"{self.row}"
-        if self.number < 10:
-            text += f"0{self.number}"
-        else:
-            text += f"{self.number}"
-
-        return text
+        return stadium_layout.seat_code(self.floor, self.section, self.row, self.number)
 
     def is_vip(self):
         """Returns True if the seat is vip.
@@ -174,16 +158,17 @@ class Seat:
 class Row:
     """Define a row of seats for a section of a stadium."""
 
-    MAX_SEATS = 10
+    MAX_SEATS = stadium_layout.SEATS_PER_ROW
 
-    def __init__(self, floor, section, number, num_seats):
+    def __init__(self, floor, section, number, num_seats, num_vip_seats=0):
         """The constructor
 
         Args:
             floor (int) the floor of the section.
             section (str): the letter of the section.
             number (int): the number of the row.
-            seats (list): the list of seats of the row.
+            num_seats (int): the number of seats of the row.
+            num_vip_seats (int, optional): the number of vip seats, the first ones of the row. Defaults to 0.
 
         Raises:
             TypeError: if floor is not a int.
@@ -206,18 +191,27 @@ class Row:
         if num_seats > self.MAX_SEATS:
             raise ValueError(f"The row can't have more than {self.MAX_SEATS} seats.")
         self.num_seats = num_seats
-        self.seats = []
-        self.create_seats()
+        self.num_vip_seats = num_vip_seats
+        self._seats = None  # created the first time they are used
+
+    @property
+    def seats(self):
+        """The list of seats of the row."""
+        if self._seats is None:
+            self._seats = self.create_seats()
+        return self._seats
 
     def create_seats(self):
         """Generates the list of seats for the given amount for the row.
 
-        Raises:
-            TypeError: if the amount is not a int.
-            ValueError: if the amount is greater than self.MAX_SEATS
+        Returns:
+            list: the seats of the row.
         """
+        seats = []
         for i in range(1, self.num_seats + 1):
-            self.seats.append(Seat(self.floor, self.section, self.number, i, "general"))
+            type = "vip" if i <= self.num_vip_seats else "general"
+            seats.append(Seat(self.floor, self.section, self.number, i, type))
+        return seats
 
     def seat(self, seat_number):
         """Returns the seat for the given number.
@@ -238,6 +232,27 @@ class Row:
             raise ValueError(f"The seat_number must be between 1 and {self.num_seats}.")
         return self.seats[seat_number - 1]
 
+    def seat_color(self, seat_number, match=None):
+        """Returns the color of a seat, without creating the seats of the row if they
+        were not used yet.
+
+        Args:
+            seat_number (int): the seat number.
+            match (Match, optional): The match to look if the seat is sold. Defaults to None.
+
+        Returns:
+            str: The color of the seat.
+        """
+        if self._seats is not None:
+            return self._seats[seat_number - 1].color(match)
+        if match and SEAT_OCCUPANCY.is_sold(
+            match, stadium_layout.seat_index(self.floor, self.section, self.number, seat_number)
+        ):
+            return Seat.SEAT_COLORS["sold"]
+        if seat_number <= self.num_vip_seats:
+            return Seat.SEAT_COLORS["vip"]
+        return Seat.SEAT_COLORS["general"]
+
     def code(self):
         """Returns the code of the row.
 
@@ -281,10 +296,9 @@ class Row:
         else:
             text.append(": ")
         seats_text = Text()
-        last_seat = len(self.seats)
-        for seat in self.seats:
-            seats_text.append(seat.text(match))
-            if seat.number < last_seat:
+        for seat_number in range(1, self.num_seats + 1):
+            seats_text.append(Text(f"[{seat_number:02d}]", style=self.seat_color(seat_number, match)))
+            if seat_number < self.num_seats:
                 seats_text.append(" ")
         if centered_seats_text:
             if self.num_seats < self.MAX_SEATS:
@@ -298,11 +312,11 @@ class Row:
 class Section:
     """The class that represents a section of the stadium"""
 
-    MAX_ROWS = 20
+    MAX_ROWS = stadium_layout.ROWS_PER_SECTION
     MAX_CAPACITY = MAX_ROWS * Row.MAX_SEATS
     MAX_NUM_CHARACTERS = 58
 
-    def __init__(self, floor, letter, location, capacity):
+    def __init__(self, floor, letter, location, capacity, vip_seats_by_row=None):
         """Constructor for Section.
 
         Args:
@@ -310,6 +324,7 @@ class Section:
             letter (str): The letter of the section.
             location (str): The location of the section.
             capacity (int): The number of seats of the section.
+            vip_seats_by_row (list, optional): the number of vip seats of every row. Defaults to None (no vip seats).
 
         Raises:
             TypeError: if letter is not a str.
@@ -332,21 +347,36 @@ class Section:
         if capacity > self.MAX_CAPACITY:
             raise ValueError(f"The section can't have more than {self.MAX_CAPACITY} seats.")
         self.capacity = capacity
-        self.num_rows = 0
-        self.rows = []
-        self.create_rows()
-
-    def create_rows(self):
-        """Generates a list of rows for the section."""
         num_rows = self.capacity // Row.MAX_SEATS
         if self.capacity % Row.MAX_SEATS > 0:
             num_rows += 1
         self.num_rows = num_rows
+        if not vip_seats_by_row:
+            vip_seats_by_row = []
+        self.vip_seats_by_row = vip_seats_by_row
+        self._rows = None  # created the first time they are used
+
+    @property
+    def rows(self):
+        """The list of rows of the section."""
+        if self._rows is None:
+            self._rows = self.create_rows()
+        return self._rows
+
+    def create_rows(self):
+        """Generates a list of rows for the section.
+
+        Returns:
+            list: the rows of the section.
+        """
+        rows = []
         missing_seats = self.capacity
-        for i in range(1, num_rows):
-            self.rows.append(Row(self.floor, self.letter, i, Row.MAX_SEATS))
-            missing_seats -= Row.MAX_SEATS
-        self.rows.append(Row(self.floor, self.letter, num_rows, missing_seats))
+        for i in range(1, self.num_rows + 1):
+            num_seats = min(missing_seats, Row.MAX_SEATS)
+            num_vip_seats = self.vip_seats_by_row[i - 1] if i <= len(self.vip_seats_by_row) else 0
+            rows.append(Row(self.floor, self.letter, i, num_seats, num_vip_seats))
+            missing_seats -= num_seats
+        return rows
 
     def text(self):
         """Returns the text of the section"""
@@ -381,8 +411,8 @@ class Section:
         """
         if not isinstance(row_number, int):
             raise TypeError("row_number must be an int.")
-        if row_number > len(self.rows) or row_number < 1:
-            raise ValueError(f"The row_number must be between 1 and {len(self.rows)}.")
+        if row_number > self.num_rows or row_number < 1:
+            raise ValueError(f"The row_number must be between 1 and {self.num_rows}.")
         return self.rows[row_number - 1]
 
     def seat(self, row_number, seat_number):
@@ -405,13 +435,13 @@ class Section:
             raise TypeError("row_number must be an int.")
         if not isinstance(seat_number, int):
             raise TypeError("seat_number must be an int.")
-        if row_number > len(self.rows) or row_number < 1:
-            raise ValueError(f"The row number must be between 1 and {len(self.rows)}.")
-        if seat_number > self.rows[row_number - 1].num_seats or seat_number < 1:
-            raise ValueError(f"The seat number must be between 1 and {self.rows[row_number - 1].num_seats}.")
+        if row_number > self.num_rows or row_number < 1:
+            raise ValueError(f"The row number must be between 1 and {self.num_rows}.")
         row = self.row(row_number)
         if not row:
             return None
+        if seat_number > row.num_seats or seat_number < 1:
+            raise ValueError(f"The seat number must be between 1 and {row.num_seats}.")
         return row.seat(seat_number)
 
     def get_rows_text(self, match=None, centered_seats_text=True):
@@ -511,9 +541,9 @@ class Stadium:
         Stadium: a stadium object
     """
 
-    MAX_NUM_SECTIONS_PER_FLOOR = 8
+    MAX_NUM_SECTIONS_PER_FLOOR = stadium_layout.SECTIONS_PER_FLOOR
     LOCATIONS = ["front", "back", "left", "right"]
-    SECTIONS_LETTERS = ["a", "b", "c", "d", "e", "f", "g", "h"]
+    SECTIONS_LETTERS = list(stadium_layout.SECTIONS_LETTERS)
     NUM_SEP_SPACES = 2
     LOCATION_DICT = {"front": "frontal", "back": "trasera", "right": "derecha", "left": "izquierda"}
 
@@ -551,11 +581,10 @@ class Stadium:
             raise TypeError("num_vip_seats must be an int.")
         self.vip_seats = num_vip_seats
         self.capacity = num_general_seats + num_vip_seats
-        self.sections = []
+        self._sections = {}  # (floor, letter): section, created the first time they are used
         self.num_floors = 0
         self.num_sections = 0
         self.create_sections()
-        self.set_vip_seats()
 
     def __str__(self):
         """The string representation of a stadium
@@ -569,35 +598,42 @@ class Stadium:
         return f"<Stadium {self.name}>"
 
     def create_sections(self):
-        """Create the sections of the stadium."""
-        num_floors = self.capacity // (self.MAX_NUM_SECTIONS_PER_FLOOR * Section.MAX_CAPACITY)
-        if self.capacity % (self.MAX_NUM_SECTIONS_PER_FLOOR * Section.MAX_CAPACITY) > 0:
-            num_floors += 1
-        self.num_floors = num_floors
-        num_sections = self.capacity // Section.MAX_CAPACITY
-        if self.capacity % Section.MAX_CAPACITY > 0:
-            num_sections += 1
-        self.num_sections = num_sections
-        needed_capacity = self.capacity
-        for i in range(1, num_floors + 1):
-            section_capacity = Section.MAX_CAPACITY
-            for section_number in range(self.MAX_NUM_SECTIONS_PER_FLOOR):
-                if section_number in {0, 1, 2}:
-                    location = self.LOCATIONS[0]
-                elif section_number in {3, 4, 5}:
-                    location = self.LOCATIONS[1]
-                elif section_number in {6}:
-                    location = self.LOCATIONS[2]
-                elif section_number in {7}:
-                    location = self.LOCATIONS[3]
-                letter = self.SECTIONS_LETTERS[section_number]
-                if needed_capacity >= section_capacity:
-                    self.sections.append(Section(i, letter, location, section_capacity))
-                else:
-                    self.sections.append(Section(i, letter, location, needed_capacity))
-                needed_capacity -= section_capacity
-                if needed_capacity <= 0:
-                    return
+        """Compute the number of floors and sections of the stadium. The sections are
+        created the first time they are used, all of them are full except the last one."""
+        self.num_floors = stadium_layout.num_floors(self.capacity)
+        self.num_sections = stadium_layout.num_sections(self.capacity)
+
+    @property
+    def sections(self):
+        """The list of sections of the stadium, sorted by floor and letter."""
+        sections = []
+        for section_index in range(self.num_sections):
+            floor = stadium_layout.section_floor(section_index)
+            letter = stadium_layout.section_letter(section_index)
+            sections.append(self.section(floor, letter))
+        return sections
+
+    def create_section(self, section_index):
+        """Create the section with the given index.
+
+        Args:
+            section_index (int): the index of the section, (floor - 1) * MAX_NUM_SECTIONS_PER_FLOOR + number.
+
+        Returns:
+            Section: the section.
+        """
+        num_rows = stadium_layout.section_num_rows(self.capacity, section_index)
+        vip_seats_by_row = [
+            stadium_layout.num_vip_seats_in_row(self.capacity, self.vip_seats, section_index, row_number)
+            for row_number in range(1, num_rows + 1)
+        ]
+        return Section(
+            stadium_layout.section_floor(section_index),
+            stadium_layout.section_letter(section_index),
+            stadium_layout.section_location(section_index),
+            stadium_layout.section_capacity(self.capacity, section_index),
+            vip_seats_by_row,
+        )
 
     def section(self, floor, letter):
         """Returns the section object for the given floor and Letter.
@@ -624,11 +660,17 @@ class Stadium:
             raise TypeError("letter must be a str.")
         if len(letter) != 1:
             raise ValueError("letter must be a single character.")
-        if letter.lower() not in self.SECTIONS_LETTERS:
+        letter = letter.lower()
+        if letter not in self.SECTIONS_LETTERS:
             raise ValueError(f"letter must be one of {self.SECTIONS_LETTERS}.")
-        for section in self.sections:
-            if section.floor == floor and section.letter == letter:
-                return section
+        section = self._sections.get((floor, letter))
+        if section is None:
+            section_index = stadium_layout.section_index(floor, letter)
+            if section_index >= self.num_sections:
+                return None
+            section = self.create_section(section_index)
+            self._sections[(floor, letter)] = section
+        return section
 
     def seat(self, floor, letter, row_number, seat_number):
         """Returns the seat for the given floor, letter, row_number and seat_number.
@@ -665,47 +707,67 @@ class Stadium:
         Returns:
             Seat: the Seat object of the seat_code given.
         """
-        if not isinstance(seat_code, str):
-            raise TypeError("seat_code must be a str.")
-        if len(seat_code) != Seat.NUM_SEAT_CODE_CHARACTERS:
-            raise ValueError(f"seat_code must be {Seat.NUM_SEAT_CODE_CHARACTERS} characters long.")
-        floor_number = seat_code[1:3]
-        if not floor_number.isdigit():
-            raise ValueError("The seat_code has a invalid floor number.")
-        floor_number = int(floor_number)
-        section_letter = seat_code[3].lower()
-        if section_letter not in self.SECTIONS_LETTERS:
-            raise ValueError(f"section_letter must be one of {self.SECTIONS_LETTERS}.")
-        row_number = seat_code[4:6]
-        if not row_number.isdigit():
-            raise ValueError("The seat_code has a invalid row number.")
-        row_number = int(row_number)
-        seat_number = seat_code[6:]
-        if not seat_number.isdigit():
-            raise ValueError("The seat_code has a invalid seat number.")
-        seat_number = int(seat_number)
+        floor_number, section_letter, row_number, seat_number = stadium_layout.parse_seat_code(seat_code)
         return self.seat(floor_number, section_letter, row_number, seat_number)
 
-    def set_vip_seats(self):
-        """Set the vip seats for the stadium."""
-        vip_seats = self.vip_seats
-        for row_number in range(1, Section.MAX_ROWS + 1):
-            for floor in range(1, self.num_floors + 1):
-                floor_sections = self.sections_by_floor(floor)
-                for section in floor_sections:
-                    if row_number > section.num_rows:
-                        continue
-                    row = section.row(row_number)
-                    if not row:
-                        continue
-                    for seat_number in range(1, row.num_seats + 1):
-                        seat = section.seat(row_number, seat_number)
-                        if not seat:
-                            break
-                        seat.set_vip()
-                        vip_seats -= 1
-                        if vip_seats == 0:
-                            return
+    def seat_index(self, floor, letter, row_number, seat_number):
+        """Returns the dense index of a seat (see stadium_layout), without creating its section.
+
+        Args:
+            floor (int): the floor number.
+            letter (str): the section letter.
+            row_number (int): the row number.
+            seat_number (int): the seat number.
+
+        Raises:
+            ValueError: if the stadium hasn't the seat.
+
+        Returns:
+            int: the index of the seat, from 0 to capacity - 1.
+        """
+        letter = letter.lower()
+        if not stadium_layout.is_valid_seat(self.capacity, floor, letter, row_number, seat_number):
+            raise ValueError("The stadium hasn't the seat.")
+        return stadium_layout.seat_index(floor, letter, row_number, seat_number)
+
+    def seat_by_index(self, index):
+        """Returns the seat with the given dense index.
+
+        Args:
+            index (int): the index of the seat.
+
+        Raises:
+            ValueError: if index is not between 0 and capacity - 1.
+
+        Returns:
+            Seat: the seat.
+        """
+        if index < 0 or index >= self.capacity:
+            raise ValueError(f"index must be between 0 and {self.capacity - 1}.")
+        return self.seat(*stadium_layout.seat_position(index))
+
+    def iter_seats_indexes(self, floor=None, location=None, letter=None):
+        """Generate the indexes of the seats of the stadium, of a floor, of a location of
+        a floor or of a section, without creating any section.
+
+        Args:
+            floor (int, optional): the floor. Defaults to None (all the floors).
+            location (str, optional): the location, needs a floor. Defaults to None.
+            letter (str, optional): the section letter, needs a floor. Defaults to None.
+
+        Yields:
+            int: the index of a seat.
+        """
+        if floor is None:
+            yield from range(self.capacity)
+        elif letter is not None:
+            yield from stadium_layout.iter_section_seats(
+                self.capacity, stadium_layout.section_index(floor, letter.lower())
+            )
+        elif location is not None:
+            yield from stadium_layout.iter_location_seats(self.capacity, floor, location)
+        else:
+            yield from stadium_layout.iter_floor_seats(self.capacity, floor)
 
     def get_section_titles_and_rows_text(self, floor, letter, match=None, centered_seats_text=True, sep_lines=1):
         """Returns the text of the section with the given floor and letter.
@@ -743,9 +805,11 @@ class Stadium:
         if floor < 1 or floor > self.num_floors:
             raise ValueError(f"floor must be between 1 and {self.num_floors}.")
         sections = []
-        for section in self.sections:
-            if section.floor == floor:
-                sections.append(section)
+        for letter in self.SECTIONS_LETTERS:
+            section = self.section(floor, letter)
+            if section is None:
+                break
+            sections.append(section)
         return sections
 
     def sections_by_location(self, floor, location):
@@ -1224,6 +1288,7 @@ class StadiumManager:
                 stadiums_data = json.load(fh)
         self.stadiums = []
         restaurant_manager.restaurants = []
+        SEAT_OCCUPANCY.clear()  # the seats of the new stadiums are free until the tickets are loaded
         for item in stadiums_data:
             stadium = Stadium(
                 id=item["id"],
@@ -0,0 +1,265 @@
+# The seats of a stadium are defined by its capacity: all the sections are full
+# except the last one, so every seat has a dense index from 0 to capacity - 1:
+#   index = section_index * SEATS_PER_SECTION + (row - 1) * SEATS_PER_ROW + number - 1
+#   section_index = (floor - 1) * SECTIONS_PER_FLOOR + position of the letter
+SECTIONS_PER_FLOOR = 8
+ROWS_PER_SECTION = 20
+SEATS_PER_ROW = 10
+SEATS_PER_SECTION = ROWS_PER_SECTION * SEATS_PER_ROW
+SEATS_PER_FLOOR = SECTIONS_PER_FLOOR * SEATS_PER_SECTION
+SECTIONS_LETTERS = ("a", "b", "c", "d", "e", "f", "g", "h")
+SECTIONS_LOCATIONS = ("front", "front", "front", "back", "back", "back", "left", "right")
+SEAT_CODE_SIZE = 8
+
+
+def num_sections(capacity):
+    """Returns the number of sections of a stadium."""
+    return -(-capacity // SEATS_PER_SECTION)
+
+
+def num_floors(capacity):
+    """Returns the number of floors of a stadium."""
+    return -(-capacity // SEATS_PER_FLOOR)
+
+
+def section_index(floor, letter):
+    """Returns the index of a section in the stadium.
+
+    Args:
+        floor (int): the floor, from 1.
+        letter (str): the letter of the section (lowercase).
+
+    Returns:
+        int: the index of the section.
+    """
+    return (floor - 1) * SECTIONS_PER_FLOOR + SECTIONS_LETTERS.index(letter)
+
+
+def section_floor(section_index):
+    """Returns the floor of a section by its index."""
+    return section_index // SECTIONS_PER_FLOOR + 1
+
+
+def section_letter(section_index):
+    """Returns the letter of a section by its index."""
+    return SECTIONS_LETTERS[section_index % SECTIONS_PER_FLOOR]
+
+
+def section_location(section_index):
+    """Returns the location (front, back, left or right) of a section by its index."""
+    return SECTIONS_LOCATIONS[section_index % SECTIONS_PER_FLOOR]
+
+
+def section_capacity(capacity, section_index):
+    """Returns the number of seats of a section, 0 if the stadium hasn't the section.
+
+    Args:
+        capacity (int): the capacity of the stadium.
+        section_index (int): the index of the section.
+
+    Returns:
+        int: the number of seats of the section.
+    """
+    return min(max(capacity - section_index * SEATS_PER_SECTION, 0), SEATS_PER_SECTION)
+
+
+def section_num_rows(capacity, section_index):
+    """Returns the number of rows of a section."""
+    return -(-section_capacity(capacity, section_index) // SEATS_PER_ROW)
+
+
+def row_num_seats(capacity, section_index, row):
+    """Returns the number of seats of a row of a section, 0 if the section hasn't the row.
+
+    Args:
+        capacity (int): the capacity of the stadium.
+        section_index (int): the index of the section.
+        row (int): the row number, from 1.
+
+    Returns:
+        int: the number of seats of the row.
+    """
+    if row < 1 or row > ROWS_PER_SECTION:
+        return 0
+    seats_before_row = (row - 1) * SEATS_PER_ROW
+    return min(max(section_capacity(capacity, section_index) - seats_before_row, 0), SEATS_PER_ROW)
+
+
+def num_vip_seats_in_row(capacity, vip_seats, section_index, row):
+    """Returns the number of vip seats of a row, the first seats of the row are vip.
+
+    The vip seats are assigned by rows: first the row 1 of every section (by floor and
+    letter), then the row 2 and so on, until there are vip_seats.
+
+    Args:
+        capacity (int): the capacity of the stadium.
+        vip_seats (int): the number of vip seats of the stadium.
+        section_index (int): the index of the section.
+        row (int): the row number, from 1.
+
+    Returns:
+        int: the number of vip seats of the row.
+    """
+    num_seats = row_num_seats(capacity, section_index, row)
+    if not num_seats:
+        return 0
+    seats_before_row = (row - 1) * SEATS_PER_ROW
+    sections = num_sections(capacity)
+    # the seats of the previous rows of every section, and of this row in the previous sections
+    vip_before = (sections - 1) * min(SEATS_PER_SECTION, seats_before_row)
+    vip_before += min(section_capacity(capacity, sections - 1), seats_before_row)
+    vip_before += section_index * SEATS_PER_ROW
+    return min(max(vip_seats - vip_before, 0), num_seats)
+
+
+def seat_index(floor, letter, row, number):
+    """Returns the dense index of a seat.
+
+    Args:
+        floor (int): the floor, from 1.
+        letter (str): the letter of the section (lowercase).
+        row (int): the row number, from 1.
+        number (int): the seat number, from 1.
+
+    Returns:
+        int: the index of the seat.
+    """
+    return section_index(floor, letter) * SEATS_PER_SECTION + (row - 1) * SEATS_PER_ROW + number - 1
+
+
+def seat_position(index):
+    """Returns the position of a seat by its index.
+
+    Args:
+        index (int): the index of the seat.
+
+    Returns:
+        tuple: (floor, letter, row, number).
+    """
+    section, offset = divmod(index, SEATS_PER_SECTION)
+    row, number = divmod(offset, SEATS_PER_ROW)
+    return section_floor(section), section_letter(section), row + 1, number + 1
+
+
+def is_valid_seat(capacity, floor, letter, row, number):
+    """Returns True if the stadium has the seat.
+
+    Args:
+        capacity (int): the capacity of the stadium.
+        floor (int): the floor, from 1.
+        letter (str): the letter of the section (lowercase).
+        row (int): the row number, from 1.
+        number (int): the seat number, from 1.
+
+    Returns:
+        bool: True if the seat exists.
+    """
+    if floor < 1 or letter not in SECTIONS_LETTERS or number < 1:
+        return False
+    return number <= row_num_seats(capacity, section_index(floor, letter), row)
+
+
+def is_vip_seat(capacity, vip_seats, index):
+    """Returns True if the seat with the given index is vip."""
+    section, offset = divmod(index, SEATS_PER_SECTION)
+    row, number = divmod(offset, SEATS_PER_ROW)
+    return number < num_vip_seats_in_row(capacity, vip_seats, section, row + 1)
+
+
+def seat_code(floor, letter, row, number):
+    """Returns the code of a seat, for example P01A0203.
+
+    Args:
+        floor (int): the floor, from 1.
+        letter (str): the letter of the section.
+        row (int): the row number, from 1.
+        number (int): the seat number, from 1.
+
+    Returns:
+        str: the code of the seat.
+    """
+    return f"P{floor:02d}{letter.upper()}{row:02d}{number:02d}"
+
+
+def seat_code_by_index(index):
+    """Returns the code of the seat with the given index."""
+    return seat_code(*seat_position(index))
+
+
+def parse_seat_code(code):
+    """Returns the position of a seat by its code.
+
+    Args:
+        code (str): the code of the seat, for example P01A0203.
+
+    Raises:
+        TypeError: if the code is not a str.
+        ValueError: if the code is not valid.
+
+    Returns:
+        tuple: (floor, letter, row, number).
+    """
+    if not isinstance(code, str):
+        raise TypeError("seat_code must be a str.")
+    if len(code) != SEAT_CODE_SIZE:
+        raise ValueError(f"seat_code must be {SEAT_CODE_SIZE} characters long.")
+    floor, letter, row, number = code[1:3], code[3].lower(), code[4:6], code[6:]
+    if not floor.isdigit():
+        raise ValueError("The seat_code has a invalid floor number.")
+    if letter not in SECTIONS_LETTERS:
+        raise ValueError(f"section_letter must be one of {list(SECTIONS_LETTERS)}.")
+    if not row.isdigit():
+        raise ValueError("The seat_code has a invalid row number.")
+    if not number.isdigit():
+        raise ValueError("The seat_code has a invalid seat number.")
+    return int(floor), letter, int(row), int(number)
+
+
+def seat_index_by_code(code):
+    """Returns the index of a seat by its code."""
+    return seat_index(*parse_seat_code(code))
+
+
+def iter_section_seats(capacity, section_index):
+    """Generate the indexes of the seats of a section.
+
+    Args:
+        capacity (int): the capacity of the stadium.
+        section_index (int): the index of the section.
+
+    Yields:
+        int: the index of a seat.
+    """
+    start = section_index * SEATS_PER_SECTION
+    yield from range(start, start + section_capacity(capacity, section_index))
+
+
+def iter_floor_seats(capacity, floor):
+    """Generate the indexes of the seats of a floor.
+
+    Args:
+        capacity (int): the capacity of the stadium.
+        floor (int): the floor, from 1.
+
+    Yields:
+        int: the index of a seat.
+    """
+    start = (floor - 1) * SEATS_PER_FLOOR
+    yield from range(start, min(max(capacity, start), start + SEATS_PER_FLOOR))
+
+
+def iter_location_seats(capacity, floor, location):
+    """Generate the indexes of the seats of a location of a floor.
+
+    Args:
+        capacity (int): the capacity of the stadium.
+        floor (int): the floor, from 1.
+        location (str): front, back, left or right.
+
+    Yields:
+        int: the index of a seat.
+    """
+    first_section = (floor - 1) * SECTIONS_PER_FLOOR
+    for position, section_location in enumerate(SECTIONS_LOCATIONS):
+        if section_location == location:
+            yield from iter_section_seats(capacity, first_section + position)
@@ -6,8 +6,9 @@ from rich.table import Table
 from rich.text import Text
 
 from constant import IVA
-from customer import Customer
+from customer import Customer, is_eligible
 from match_and_team import Match
+from occupancy import SEAT_OCCUPANCY
 from stadium import Seat
 
 
@@ -17,8 +18,9 @@ class Ticket:
         "vip": 75.0,
     }
     DISCOUNT_TYPES_AND_PERCENTAGES = {"vampire_number": 50.0}
+    DISCOUNT_TIME_BUDGET = 3.0  # max seconds to wait for the customer's vampire flag, after that no discount
 
-    def __init__(self, customer, match, seat, code=None, used=None):
+    def __init__(self, customer, match, seat, code=None, used=None, vampire_discount=None):
         """Initialize a Ticket.
 
         Args:
@@ -26,6 +28,8 @@ class Ticket:
             match (Match): the match obj.
 
             seat (int): the seat number.
+            vampire_discount (bool, optional): the saved decision of the vampire discount.
+                Defaults to None (decided the first time the amounts are computed).
 
         Raises:
             ValueError: if type is not in TICKET_TYPES_AND_PRICES.keys().
@@ -53,6 +57,10 @@ class Ticket:
             if not isinstance(used, bool):
                 raise TypeError("Used must be None or bool.")
             self.used = used
+        if vampire_discount is not None and not isinstance(vampire_discount, bool):
+            raise TypeError("Vampire discount must be None or bool.")
+        self.vampire_discount = vampire_discount
+        self.discount_timed_out = False  # True if the vampire flag wasn't ready in DISCOUNT_TIME_BUDGET
 
     def __str__(self):
         """The ticket str representation.
@@ -81,11 +89,24 @@ class Ticket:
         Returns:
             Float: the discount amount.
         """
-        if self.customer.is_vampire():
+        if self.vampire_discount is None:  # decided once, so the amounts of the ticket are consistent
+            self.decide_discount(self.DISCOUNT_TIME_BUDGET)
+        if self.vampire_discount:
             discount = self.DISCOUNT_TYPES_AND_PERCENTAGES["vampire_number"]
             return round(self.price * discount / 100, 2)
         return 0.0
 
+    def decide_discount(self, timeout=None):
+        """Decide if the ticket has the vampire discount, waiting at most timeout seconds
+        for the customer's vampire flag. If it's not ready, the ticket has no discount and
+        discount_timed_out is True.
+
+        Args:
+            timeout (float, optional): the max seconds to wait. Defaults to None (wait until it's ready).
+        """
+        self.vampire_discount = is_eligible(self.customer.is_vampire, timeout)
+        self.discount_timed_out = self.customer.vampire is None
+
     def get_total_price(self):
         """Returns the total price.
 
@@ -291,6 +312,7 @@ class TicketManager:
                 return ticket
 
     def load_tickets_data(self, customer_manager, match_manager, stadium_manager):
+        SEAT_OCCUPANCY.clear()
         if not os.path.exists(self.DATA_FILENAME):
             return
         with open(self.DATA_FILENAME, "r", encoding="utf-8") as fh:
@@ -306,8 +328,10 @@ class TicketManager:
             seat = stadium.seat_by_code(seat_code)
             code = item["code"]
             used = item["used"]
-            ticket = Ticket(customer, match, seat, code, used)
+            vampire_discount = item.get("vampire_discount")  # the tickets saved before it are decided again
+            ticket = Ticket(customer, match, seat, code, used, vampire_discount)
             self.add_ticket(ticket)
+            seat.sold(match)  # the occupancy of the matches is rebuilt from the tickets
 
     def save_tickets_data(self):
         tickets_data = []
@@ -318,6 +342,7 @@ class TicketManager:
                 "seat_code": ticket.seat.code(),
                 "code": ticket.code,
                 "used": ticket.used,
+                "vampire_discount": ticket.vampire_discount,
             }
             tickets_data.append(item)
         with open(self.DATA_FILENAME, "w", encoding="utf-8") as fh:
@@ -47,9 +47,26 @@ class UserManager:
 
     def __init__(self):
         """Constructor"""
-        self.users = []
+        self.users_by_id = {}  # normalized user_id: user, in the order they were added
         first_admin_user = User(**self.FIRST_ADMIN)
-        self.users.append(first_admin_user)
+        self.add_user(first_admin_user)
+
+    @property
+    def users(self):
+        """The list of users, in the order they were added."""
+        return list(self.users_by_id.values())
+
+    @staticmethod
+    def normalize_user_id(user_id):
+        """Returns the user_id as it's used in the index of users.
+
+        Args:
+            user_id (str): the id of the user.
+
+        Returns:
+            str: the normalized user_id.
+        """
+        return user_id.lower()
 
     def add_user(self, user):
         """Add a user to the user manager list of users.
@@ -63,14 +80,31 @@ class UserManager:
         """
         if not isinstance(user, User):
             raise TypeError("User must be an instance of User.")
-        found = False
-        for item in self.users:
-            if item.user_id.lower() == user.user_id.lower():
-                found = True
-                break
-        if found:
+        key = self.normalize_user_id(user.user_id)
+        if key in self.users_by_id:
             raise ValueError("User ID already exists.")
-        self.users.append(user)
+        self.users_by_id[key] = user
+
+    def add_users(self, users):
+        """Add several users at once, for example the staff of a tournament. If any user
+        is not valid none of them is added.
+
+        Args:
+            users (iterable): the users to be added.
+
+        Raises:
+            TypeError: if any user is not a User obj.
+            ValueError: if any user ID already exists or it's repeated.
+        """
+        new_users = {}
+        for user in users:
+            if not isinstance(user, User):
+                raise TypeError("User must be an instance of User.")
+            key = self.normalize_user_id(user.user_id)
+            if key in self.users_by_id or key in new_users:
+                raise ValueError(f"User ID already exists: {user.user_id}.")
+            new_users[key] = user
+        self.users_by_id.update(new_users)
 
     def remove_user(self, user):
         """Removes a user from the user manager list.
@@ -83,8 +117,9 @@ class UserManager:
         """
         if not isinstance(user, User):
             raise TypeError("User must be an instance of User.")
-        if user in self.users:
-            self.users.remove(user)
+        key = self.normalize_user_id(user.user_id)
+        if self.users_by_id.get(key) is user:
+            del self.users_by_id[key]
 
     def get_user_by_id(self, user_id):
         """Returns the user associated with the given user_id.
@@ -101,10 +136,7 @@ class UserManager:
         """
         if not isinstance(user_id, str):
             raise TypeError("User ID must be a str.")
-        for user in self.users:
-            if user.user_id.lower() == user_id.lower():
-                return user
-        return None
+        return self.users_by_id.get(self.normalize_user_id(user_id))
 
     def authenticate(self, user_id, password):
         """Returns True if the user is authenticated.
@@ -126,19 +158,49 @@ class UserManager:
             return True
         return False
 
+    @staticmethod
+    def user_from_data(item):
+        """Returns a user from its saved data.
+
+        Args:
+            item (dict): the user data.
+
+        Returns:
+            User: the user.
+        """
+        return User(item["full_name"], item["user_id"], item["password"], item["type"])
+
+    def import_users_data(self, filename):
+        """Add the users of a json file with the format of users.json, for example
+        the sellers and security staff of a tournament.
+
+        Args:
+            filename (str): the name of the json file.
+
+        Raises:
+            ValueError: if any user ID already exists or it's repeated.
+
+        Returns:
+            int: the number of users added.
+        """
+        with open(filename, "r", encoding="utf-8") as fh:
+            users_data = json.load(fh)
+        users = [self.user_from_data(item) for item in users_data]
+        self.add_users(users)
+        return len(users)
+
     def load_users_data(self):
         if not os.path.exists(self.DATA_FILENAME):
             return
         with open(self.DATA_FILENAME, "r", encoding="utf-8") as fh:
             users_data = json.load(fh)
-        self.users = []
-        for item in users_data:
-            full_name = item["full_name"]
-            user_id = item["user_id"]
-            password = item["password"]
-            type = item["type"]
-            user = User(full_name, user_id, password, type)
-            self.add_user(user)
+        previous_users = self.users_by_id
+        self.users_by_id = {}
+        try:
+            self.add_users(self.user_from_data(item) for item in users_data)
+        except Exception:
+            self.users_by_id = previous_users  # a invalid file doesn't leave the manager without users
+            raise
 
     def save_users_data(self):
         users_data = []
@@ -1,3 +1,119 @@
+import math
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from cache import LRUCache
+from vampire_table import VampireTable
+
+# For the fangs x, y of a number: x * y ≡ x + y (mod 9). These are the only
+# residues (x % 9: y % 9) that satisfy it, so a vampire number is ≡ 0 or 4 (mod 9).
+FANG_MOD_9_PAIRS = {0: 0, 2: 2, 3: 6, 5: 8, 6: 3, 8: 5}
+VAMPIRE_MOD_9 = {0, 4}
+
+# Precomputed table, it's only opened the first time a number is looked up.
+LOOKUP_TABLE = VampireTable()
+
+# Answers of vampire_number shared by all the callers of the process, by
+# (number, all_fangs, method, use_table).
+VAMPIRE_CACHE = LRUCache(maxsize=100000)
+NOT_CACHED = object()
+
+# How many numbers and fang candidates every pruning stage has rejected. A candidate
+# is a value of fang1 in the division search and a split of the digits in the
+# permutation search; every candidate is counted in just one candidate_* stage
+# and "candidates" is their sum.
+PRUNING_STATS = {
+    "numbers": 0,
+    "odd_digits": 0,
+    "mod_9": 0,
+    "last_digit": 0,
+    "candidates": 0,
+    "candidate_mod_9": 0,
+    "candidate_magnitude": 0,
+    "candidate_last_digit": 0,
+    "candidate_trailing_zeros": 0,
+    "candidate_not_divisor": 0,
+    "candidate_tested": 0,
+}
+
+CANDIDATE_STAGES = [
+    "candidate_mod_9",
+    "candidate_magnitude",
+    "candidate_last_digit",
+    "candidate_trailing_zeros",
+    "candidate_not_divisor",
+    "candidate_tested",
+]
+
+
+def get_pruning_stats():
+    """Returns a copy of the pruning counters.
+
+    Returns:
+        dict: the number of numbers and candidates rejected by every stage.
+    """
+    return PRUNING_STATS.copy()
+
+
+def reset_pruning_stats():
+    """Set all the pruning counters to zero."""
+    for key in PRUNING_STATS:
+        PRUNING_STATS[key] = 0
+
+
+def count_pruning(**counters):
+    """Add the given amounts to the pruning counters.
+
+    Args:
+        counters (int): the amount to add for every counter name.
+    """
+    for key, value in counters.items():
+        PRUNING_STATS[key] += value
+
+
+def fang_last_digits(number_digits):
+    """Returns the digits that could be the last digit of a fang.
+
+    The product of the last digits of both fangs must end with the last digit of the
+    number, and both last digits are digits of the number.
+
+    Args:
+        number_digits (str): the digits of the number.
+
+    Returns:
+        set: the possible last digits (ints) of the fangs.
+    """
+    last_digit = int(number_digits[-1])
+    digits = [int(digit) for digit in number_digits]
+    result = set()
+    for i, digit1 in enumerate(digits):
+        for j, digit2 in enumerate(digits):
+            if i != j and digit1 * digit2 % 10 == last_digit:
+                result.add(digit1)
+    return result
+
+
+def number_rejection_stage(number_digits, number):
+    """Returns the name of the first pruning stage that rejects the number.
+
+    Args:
+        number_digits (str): the digits of the number.
+        number (int): the number.
+
+    Returns:
+        str|None: "odd_digits", "mod_9" or "last_digit" if the number couldn't be a
+            vampire number, None otherwise.
+    """
+    if len(number_digits) % 2 != 0:
+        return "odd_digits"  # if the number of digits is not even, it couldn't be a vampire number
+    if number % 9 not in VAMPIRE_MOD_9:
+        return "mod_9"
+    if not fang_last_digits(number_digits):
+        return "last_digit"
+    return None
+
+
 def combination(elements, m, combination_temp=None, index=0, result=None):
     """
     Generate a combination list of m elements from a list of n elements.
@@ -62,18 +178,159 @@ def remove_duplicates(elements):
     Returns:
         list: a list of elements without duplicates.
     """
-    new_list = []
+    return list(iter_unique(elements))
+
+
+def iter_combinations(elements, m):
+    """Generate the combinations of m elements from a list of n elements, one at a time.
+
+    Args:
+        elements (list): the list of elements.
+        m (int): the number of elements in every combination.
+
+    Yields:
+        tuple: a combination of m elements of element list.
+    """
+    combination_temp = []
+    num_elements = len(elements)
+
+    def combine(index):
+        if len(combination_temp) == m:
+            yield tuple(combination_temp)
+            return
+        for i in range(index, num_elements - (m - len(combination_temp)) + 1):
+            combination_temp.append(elements[i])
+            yield from combine(i + 1)
+            combination_temp.pop()
+
+    return combine(0)
+
+
+def iter_permutations(elements, unique=False):
+    """Generate the permutations of the given elements, one at a time.
+
+    Args:
+        elements (list): the list of elements to make the permutation.
+        unique (bool): if True, the repeated permutations (due to repeated elements) are skipped.
+
+    Yields:
+        tuple: a permutation of the elements in the list.
+    """
+    temp_permutation = []
+    used = [False] * len(elements)
+
+    def permute():
+        if len(temp_permutation) == len(elements):
+            yield tuple(temp_permutation)
+            return
+        tried = set()
+        for i, element in enumerate(elements):
+            if used[i]:
+                continue
+            if unique:
+                if element in tried:
+                    continue
+                tried.add(element)
+            used[i] = True
+            temp_permutation.append(element)
+            yield from permute()
+            temp_permutation.pop()
+            used[i] = False
+
+    return permute()
+
+
+def digits_value(digits):
+    """Returns the int value of a list of digits (ints), accumulating the place values.
+
+    Args:
+        digits (list): the digits, the most significant first.
+
+    Returns:
+        int: the value.
+    """
+    value = 0
+    for digit in digits:
+        value = value * 10 + digit
+    return value
+
+
+def iter_permutation_values(digits):
+    """Generate the int value of every distinct permutation of the digits (ints) that
+    doesn't start with 0. The values are accumulated digit by digit, so no
+    permutation list or str is created.
+
+    Args:
+        digits (list): the digits as ints.
+
+    Yields:
+        int: the value of a permutation.
+    """
+    num_digits = len(digits)
+    used = [False] * num_digits
+
+    def build(value, depth):
+        if depth == num_digits:
+            yield value
+            return
+        tried = 0  # bitmask of the digits already tried in this position
+        for i, digit in enumerate(digits):
+            if used[i] or tried >> digit & 1:
+                continue
+            if depth == 0 and digit == 0:  # the fang could not start with 0
+                continue
+            tried |= 1 << digit
+            used[i] = True
+            yield from build(value * 10 + digit, depth + 1)
+            used[i] = False
+
+    return build(0, 0)
+
+
+def iter_unique(elements):
+    """Generate the elements without duplicates, two elements are duplicated if they
+    have the same items in any order.
+
+    Args:
+        elements (iterable): The elements.
+
+    Yields:
+        list|tuple: the elements without duplicates.
+    """
+    seen = set()
     for item in elements:
-        item_set = set(item)
-        found = False
-        for new_item in new_list:
-            new_item_set = set(new_item)
-            if item_set == new_item_set:
-                found = True
-                break
-        if not found:
-            new_list.append(item)
-    return new_list
+        canonical = tuple(sorted(item))
+        if canonical in seen:
+            continue
+        seen.add(canonical)
+        yield item
+
+
+def iter_fang_digits_pairs(digits):
+    """Generate the pairs of possible digits for the fangs, one at a time.
+
+    Args:
+        digits (list): a list of digits for be used to generate the fangs digits.
+
+    Raises:
+        ValueError: if the number of digits is not even.
+
+    Yields:
+        list: a pair of possible fangs digits.
+    """
+    if len(digits) % 2 != 0:
+        raise ValueError("Invalid number of digits.")
+
+    fang_size = len(digits) // 2  # get the fang_size
+    seen = set()
+    for indexes in iter_combinations(range(len(digits)), fang_size):
+        fang = [digits[i] for i in indexes]
+        canonical = tuple(sorted(fang))
+        if canonical in seen:  # skip duplicates, due to duplicates digits.
+            continue
+        seen.add(canonical)
+        other_fang_digits = [digit for i, digit in enumerate(digits) if i not in indexes]
+        yield [fang, other_fang_digits]  # So the other fang should be made with this digits.
 
 
 def get_fang_digits_pairs(digits):
@@ -88,27 +345,179 @@ def get_fang_digits_pairs(digits):
     Returns:
         list: pairs of possible fangs digits.
     """
-    if len(digits) % 2 != 0:
-        raise ValueError("Invalid number of digits.")
+    return list(iter_fang_digits_pairs(digits))
 
-    fang_size = len(digits) // 2  # get the fang_size
-    fangs = combination(digits, fang_size)  # posible combination of digits of the fangs size
-    fangs = remove_duplicates(fangs)  # remove duplicates, due to duplicates digits.
-    fang_digits_pairs = []
-    for fang in fangs:
-        other_fang_digits = digits.copy()  # create a copy of the digits and then remove the digits of the found fang
-        for digit in fang:
-            other_fang_digits.remove(digit)
-        fang_digits_pairs.append([fang, other_fang_digits])  # So the other fang should be made with this digits.
-    return fang_digits_pairs
-
-
-def vampire_number(number, all_fangs=False):
+
+def fangs_by_permutation(number, all_fangs=False):
+    """Search the fangs of the number permuting its digits.
+
+    Args:
+        number (int): The number to check if it is a vampire number.
+        all_fangs (bool): if True, return all the possible fangs, else return only one.
+
+    Returns:
+        list|None: a list of two ints(fangs) if the number is a vampires number or None otherwise.
+    """
+    number_digits = str(number)
+    PRUNING_STATS["numbers"] += 1
+    stage = number_rejection_stage(number_digits, number)
+    if stage:
+        PRUNING_STATS[stage] += 1
+        return None
+
+    digits = [int(digit) for digit in number_digits]  # getting all the digits of the number as ints
+    fang_size = len(digits) // 2
+    min_fang1 = -(-number // (10**fang_size - 1))  # fang2 can't have more digits than fang1
+    max_fang1 = math.isqrt(number)  # fang1 <= fang2
+    last_digits = fang_last_digits(number_digits)
+    number_last_digit = number % 10
+    # for every last digit of fang1, the last digits of fang2 that give the last digit of the number
+    # (both fangs couldn't ends with 0)
+    fang2_last_digits = [
+        [digit2 for digit2 in range(10) if digit1 * digit2 % 10 == number_last_digit and digit1 + digit2 > 0]
+        for digit1 in range(10)
+    ]
+    stats = dict.fromkeys(CANDIDATE_STAGES, 0)
+
+    fang_digits_pairs = iter_fang_digits_pairs(digits)  # getting the digits for generate the fangs.
+
+    all_fangs_pairs = []
+    for fangs_digits in fang_digits_pairs:  # the fangs will be made by permuting the digits
+        # the digits sum (so the residue mod 9) of a fang doesn't depend on the order of its digits.
+        if FANG_MOD_9_PAIRS.get(sum(fangs_digits[0]) % 9) != sum(fangs_digits[1]) % 9:
+            stats["candidate_mod_9"] += 1
+            continue
+        if digits_value(sorted(fangs_digits[0], reverse=True)) < min_fang1:
+            stats["candidate_magnitude"] += 1
+            continue
+        if not last_digits.intersection(fangs_digits[0]) or not last_digits.intersection(fangs_digits[1]):
+            stats["candidate_last_digit"] += 1
+            continue
+        # the values of the fang2 permutations are computed once, grouped by their last digit.
+        fang2_by_last_digit = [[] for _ in range(10)]
+        for fang2 in iter_permutation_values(fangs_digits[1]):
+            fang2_by_last_digit[fang2 % 10].append(fang2)
+        # the split is counted in the last stage that any of its pairs of fangs reached
+        stage = "candidate_magnitude"
+        for fang1 in iter_permutation_values(fangs_digits[0]):
+            if fang1 < min_fang1 or fang1 > max_fang1:
+                continue
+            fang1_last_digit = fang1 % 10
+            for fang2_last_digit in fang2_last_digits[fang1_last_digit]:
+                for fang2 in fang2_by_last_digit[fang2_last_digit]:
+                    stage = "candidate_tested"
+                    if fang1 * fang2 == number:  # if True, is a vampire number!!!
+                        all_fangs_pairs.append([fang1, fang2])
+            if stage != "candidate_tested":
+                if fang1_last_digit == 0 and number_last_digit == 0 and fang2_by_last_digit[0]:
+                    stage = "candidate_trailing_zeros"
+                elif stage == "candidate_magnitude":
+                    stage = "candidate_last_digit"
+            if all_fangs_pairs and not all_fangs:
+                break
+        stats[stage] += 1
+        if all_fangs_pairs and not all_fangs:
+            break
+    count_pruning(candidates=sum(stats.values()), **stats)
+    if not all_fangs_pairs:
+        return None
+    if not all_fangs:
+        return all_fangs_pairs[0]
+    all_fangs_pairs = remove_duplicates(all_fangs_pairs)
+    all_fangs_pairs.sort()
+    return all_fangs_pairs
+
+
+def fangs_by_division(number, all_fangs=False):
+    """Search the fangs of the number dividing it by the candidates for the first fang.
+
+    Only the divisors with the fang size are tried, and the digits of every pair
+    of fangs found are compared with the digits of the number (digit signature).
+
+    Args:
+        number (int): The number to check if it is a vampire number.
+        all_fangs (bool): if True, return all the possible fangs, else return only one.
+
+    Returns:
+        list|None: a list of two ints(fangs) if the number is a vampires number or None otherwise.
+    """
+    number_digits = str(number)
+    PRUNING_STATS["numbers"] += 1
+    stage = number_rejection_stage(number_digits, number)
+    if stage:
+        PRUNING_STATS[stage] += 1
+        return None
+
+    signature = sorted(number_digits)
+    fang_size = len(number_digits) // 2
+    min_fang = 10 ** (fang_size - 1)
+    max_fang = 10**fang_size - 1
+    first_fang1 = max(min_fang, -(-number // max_fang))  # fang2 can't have more digits than fang1
+    last_fang1 = math.isqrt(number)  # fang1 <= fang2
+    fang1_mod_9 = {r for r, s in FANG_MOD_9_PAIRS.items() if r * s % 9 == number % 9}
+    last_digits = fang_last_digits(number_digits)
+    stats = dict.fromkeys(CANDIDATE_STAGES, 0)
+    stats["candidate_magnitude"] = max_fang - min_fang + 1 - max(0, last_fang1 - first_fang1 + 1)
+    all_fangs_pairs = []
+    for fang1 in range(first_fang1, last_fang1 + 1):
+        if fang1 % 9 not in fang1_mod_9:
+            stats["candidate_mod_9"] += 1
+            continue
+        if fang1 % 10 not in last_digits:
+            stats["candidate_last_digit"] += 1
+            continue
+        if number % fang1 != 0:
+            stats["candidate_not_divisor"] += 1
+            continue
+        fang2 = number // fang1
+        if fang1 % 10 == 0 and fang2 % 10 == 0:  # both fangs couldn't ends with 0
+            stats["candidate_trailing_zeros"] += 1
+            continue
+        stats["candidate_tested"] += 1
+        if sorted(str(fang1) + str(fang2)) == signature:  # if True, is a vampire number!!!
+            all_fangs_pairs.append([fang1, fang2])
+            if not all_fangs:
+                break
+    count_pruning(candidates=sum(stats.values()), **stats)
+    if not all_fangs_pairs:
+        return None
+    if not all_fangs:
+        return all_fangs_pairs[0]
+    return all_fangs_pairs
+
+
+def use_lookup_table(table):
+    """Set the precomputed table used by vampire_number.
+
+    Args:
+        table (VampireTable|None): the table, or None to always compute the fangs.
+
+    Raises:
+        TypeError: if table is not a VampireTable or None.
+    """
+    global LOOKUP_TABLE
+    if table is not None and not isinstance(table, VampireTable):
+        raise TypeError("table must be a VampireTable or None.")
+    LOOKUP_TABLE = table
+
+
+def vampire_number(number, all_fangs=False, method="division", use_table=True):
     """Return a pair of fangs, if the number is a vampire number, else return None.
 
+    The answers are kept in VAMPIRE_CACHE. If the number is inside the precomputed
+    table (LOOKUP_TABLE), the answer comes from the table, otherwise the fangs are searched.
+
     Args:
         number (int|str): The number to check if it is a vampire number.
         all_fangs (bool): if True, return all the possible fangs, else return only one.
+        method (str): "division" to search the fangs dividing by the candidates, or
+            "permutation" to search them permuting the digits of the number.
+        use_table (bool): if False, the precomputed table is not used.
+
+    Raises:
+        TypeError: if the number is not a str or int.
+        ValueError: if the str is not a number.
+        ValueError: if the method is invalid.
 
     Returns:
         list|None: a list of two ints(fangs) if the number is a vampires number or None otherwise.
@@ -119,37 +528,176 @@ def vampire_number(number, all_fangs=False):
         if not number.isdigit():
             raise ValueError("Invalid number")
         number = int(number)
+    if number <= 0:
+        return None
+    if method not in ("division", "permutation"):
+        raise ValueError("Invalid method")
+
+    key = (number, bool(all_fangs), method, bool(use_table))
+    fangs = VAMPIRE_CACHE.get(key, NOT_CACHED)
+    if fangs is NOT_CACHED:
+        fangs = search_fangs(number, all_fangs, method, use_table)
+        VAMPIRE_CACHE.put(key, fangs)
+    if fangs is None:
+        return None
+    if all_fangs:
+        return [pair.copy() for pair in fangs]
+    return fangs.copy()
 
-    digits = [digit for digit in str(number)]  # getting all the digits of the number
-    if len(digits) % 2 != 0:
-        return None  # if the number of digits is not even, it couldn't be a vampire number
 
-    fang_digits_pairs = get_fang_digits_pairs(digits)  # getting the digits for generate the fangs.
+def search_fangs(number, all_fangs, method, use_table):
+    """Returns the fangs of the number from the lookup table or searching them.
 
-    if all_fangs:
-        all_fangs_pairs = []
+    Args:
+        number (int): The number to check if it is a vampire number.
+        all_fangs (bool): if True, return all the possible fangs, else return only one.
+        method (str): "division" or "permutation".
+        use_table (bool): if False, the precomputed table is not used.
 
-    for fangs_digits in fang_digits_pairs:  # the fangs will be made by permuting the digits
-        fang1_permutations = permutation(fangs_digits[0])
-        fang2_permutations = permutation(fangs_digits[1])
-        for fang1 in fang1_permutations:
-            if int(fang1[0]) == 0:  # the fang could not start with 0
+    Returns:
+        list|None: a list of two ints(fangs) if the number is a vampires number or None otherwise.
+    """
+    if use_table and LOOKUP_TABLE is not None:
+        answer = LOOKUP_TABLE.is_vampire(number)
+        if answer is False:
+            return None
+        if answer:
+            fangs = LOOKUP_TABLE.fangs(number)
+            if fangs:
+                return fangs if all_fangs else fangs[0]
+
+    if method == "division":
+        return fangs_by_division(number, all_fangs)
+    return fangs_by_permutation(number, all_fangs)
+
+
+def vampire_numbers_in_range(start, end, all_fangs=False):
+    """Generate the vampire numbers in the range [start, end] with their fangs.
+
+    Instead of checking every number of the range, the fangs space is walked:
+    every pair of fangs with the right number of digits is multiplied and the
+    digits of the product are compared with the digits of the fangs.
+
+    Args:
+        start (int): the first number of the range.
+        end (int): the last number of the range (included).
+        all_fangs (bool): if True, yield all the possible fangs, else yield only one pair.
+
+    Raises:
+        TypeError: if start or end are not ints.
+        ValueError: if start is greater than end.
+
+    Yields:
+        list: [number, fangs] for every vampire number in ascending order, where
+            fangs is a list of two ints or a list of pairs if all_fangs is True.
+    """
+    if not isinstance(start, int) or not isinstance(end, int):
+        raise TypeError("start and end must be ints.")
+    if start > end:
+        raise ValueError("start must be less or equal than end.")
+    start = max(start, 10)
+    num_digits = len(str(start))
+    if num_digits % 2 != 0:
+        num_digits += 1
+    while 10 ** (num_digits - 1) <= end:
+        fang_size = num_digits // 2
+        min_fang = 10 ** (fang_size - 1)
+        max_fang = 10**fang_size - 1
+        low = max(start, 10 ** (num_digits - 1))
+        high = min(end, 10**num_digits - 1)
+        vampires = {}
+        for fang1 in range(min_fang, max_fang + 1):
+            if fang1 * fang1 > high:  # fang1 <= fang2, so there are no more products in the range
+                break
+            first_fang2 = max(fang1, -(-low // fang1))
+            last_fang2 = min(max_fang, high // fang1)
+            if fang1 % 9 not in FANG_MOD_9_PAIRS:
                 continue
-            fang1 = "".join(fang1)  # joining to get a str of the fang
-            for fang2 in fang2_permutations:
-                if int(fang2[0]) == 0:  # the fang could not start with 0
+            first_fang2 += (FANG_MOD_9_PAIRS[fang1 % 9] - first_fang2) % 9  # x * y ≡ x + y (mod 9)
+            fang1_digits = str(fang1)
+            for fang2 in range(first_fang2, last_fang2 + 1, 9):
+                if fang1 % 10 == 0 and fang2 % 10 == 0:  # both fangs couldn't ends with 0
                     continue
-                if int(fang1[-1]) == 0 and int(fang2[-1]) == 0:  # both fangs couldn't ends with 0
-                    continue
-                fang2 = "".join(fang2)  # joining to get a str of the fang
-                if int(fang1) * int(fang2) == number:  # if True, is a vampire number!!!
-                    if not all_fangs:
-                        return [int(fang1), int(fang2)]
-                    all_fangs_pairs.append([int(fang1), int(fang2)])
-    if all_fangs and all_fangs_pairs:
-        all_fangs_pairs = remove_duplicates(all_fangs_pairs)
-        return all_fangs_pairs
-    return None
+                product = fang1 * fang2
+                if sorted(fang1_digits + str(fang2)) == sorted(str(product)):
+                    vampires.setdefault(product, []).append([fang1, fang2])
+        for number in sorted(vampires):
+            if all_fangs:
+                yield [number, vampires[number]]
+            else:
+                yield [number, vampires[number][0]]
+        num_digits += 2
+
+
+def screen_chunk(idents, all_fangs=False):
+    """Returns the answer of vampire_number for every ident of the chunk.
+
+    Args:
+        idents (list): a list of idents (int|str).
+        all_fangs (bool): if True, return all the possible fangs, else return only one.
+
+    Returns:
+        list: the answers of vampire_number in the same order of idents.
+    """
+    return [vampire_number(ident, all_fangs) for ident in idents]
+
+
+def screen_idents(idents, workers=None, chunk_size=1000, all_fangs=False):
+    """Generate the answer of vampire_number for every ident using several processes.
+
+    The idents are sent in chunks to a process pool and the answers are yielded in
+    the same order of the idents as soon as they are ready, so just a few chunks are
+    in memory at the same time.
+
+    Args:
+        idents (iterable): the idents (int|str) to check.
+        workers (int, optional): the number of processes. Defaults to the number of CPUs.
+        chunk_size (int, optional): the number of idents sent to a process at once. Defaults to 1000.
+        all_fangs (bool): if True, return all the possible fangs, else return only one.
+
+    Raises:
+        TypeError: if workers is not an int or None.
+        ValueError: if workers < 1.
+        TypeError: if chunk_size is not an int.
+        ValueError: if chunk_size < 1.
+
+    Yields:
+        list|None: the answer of vampire_number for every ident.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if not isinstance(workers, int):
+        raise TypeError("workers must be an int.")
+    if workers < 1:
+        raise ValueError("workers must be a positive integer.")
+    if not isinstance(chunk_size, int):
+        raise TypeError("chunk_size must be an int.")
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be a positive integer.")
+
+    def chunks():
+        chunk = []
+        for ident in idents:
+            chunk.append(ident)
+            if len(chunk) == chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    if workers == 1:
+        for chunk in chunks():
+            yield from screen_chunk(chunk, all_fangs)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks():
+            pending.append(executor.submit(screen_chunk, chunk, all_fangs))
+            if len(pending) >= 2 * workers:  # keep the workers busy without reading all the idents
+                yield from pending.popleft().result()
+        while pending:
+            yield from pending.popleft().result()
 
 
 if __name__ == "__main__":
@@ -185,13 +733,9 @@ if __name__ == "__main__":
             125500,
         ]
         numbers = [i for i in range(0, 125501)]
-        vampires = []
 
         os.system("cls")
-        for number in numbers:
-            answer = vampire_number(number)
-            if answer:
-                vampires.append([number, answer])
+        vampires = list(vampire_numbers_in_range(numbers[0], numbers[-1]))
 
         print("Vampires returning just one pair of fangs...")
         print(vampires)
@@ -203,11 +747,7 @@ if __name__ == "__main__":
         print(len(vampires))
         print("------------------------------------------------")
 
-        vampires = []
-        for number in numbers:
-            answer = vampire_number(number, True)
-            if answer:
-                vampires.append([number, answer])
+        vampires = list(vampire_numbers_in_range(numbers[0], numbers[-1], all_fangs=True))
 
         print("Vampires returning all pairs of fangs...")
         print(vampires)
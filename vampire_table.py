@@ -0,0 +1,245 @@
+import mmap
+import os
+import struct
+from bisect import bisect_left
+
+
+class VampireTable:
+    """Precomputed lookup table of vampire numbers.
+
+    The table is a bitset on disk where the bit n is set if n is a vampire number,
+    for every n lower than the bound of the table. The fangs of the vampire numbers
+    could be saved in an optional side table, a binary file of (number, fang1, fang2)
+    records sorted by number that is searched with bisect. The files are opened with
+    mmap the first time the table is used.
+    """
+
+    DATA_FILENAME = "vampires.bin"
+    FANGS_FILENAME = "vampires_fangs.bin"
+    MAGIC = b"VAMP"
+    FANGS_MAGIC = b"FANG"
+    HEADER_FORMAT = "<4sQ"  # magic, bound (number of records in the fangs table)
+    HEADER_SIZE = struct.calcsize(HEADER_FORMAT)
+    FANGS_RECORD_FORMAT = "<QQQ"  # number, fang1, fang2
+    FANGS_RECORD_SIZE = struct.calcsize(FANGS_RECORD_FORMAT)
+    WRITE_BLOCK_SIZE = 1 << 20
+
+    def __init__(self, filename=None, fangs_filename=None):
+        """Initialize the table, the files are not opened until the first lookup.
+
+        Args:
+            filename (str, optional): the bitset file. Defaults to DATA_FILENAME.
+            fangs_filename (str, optional): the fangs side table file. Defaults to FANGS_FILENAME.
+        """
+        if filename is None:
+            filename = self.DATA_FILENAME
+        if not isinstance(filename, str):
+            raise TypeError("filename must be a str.")
+        self.filename = filename
+        if fangs_filename is None:
+            fangs_filename = self.FANGS_FILENAME
+        if not isinstance(fangs_filename, str):
+            raise TypeError("fangs_filename must be a str.")
+        self.fangs_filename = fangs_filename
+        self.bound = 0
+        self._loaded = False
+        self._file = None
+        self._bits = None
+        self._fangs_loaded = False
+        self._fangs_file = None
+        self._fangs = None
+        self.num_fangs = 0
+
+    def build(self, bound, with_fangs=True):
+        """Compute the vampire numbers lower than bound and save them in the table files.
+
+        Args:
+            bound (int): the numbers lower than bound are included in the table.
+            with_fangs (bool, optional): if True, the fangs side table is saved too. Defaults to True.
+
+        Raises:
+            TypeError: if bound is not an int.
+            ValueError: if bound < 1.
+        """
+        from vampire_number import vampire_numbers_in_range
+
+        if not isinstance(bound, int):
+            raise TypeError("bound must be an int.")
+        if bound < 1:
+            raise ValueError("bound must be a positive integer.")
+        self.close()
+        num_bytes = (bound + 7) // 8
+        fangs_fh = open(self.fangs_filename, "wb") if with_fangs else None
+        num_fangs = 0
+        if fangs_fh is not None:
+            fangs_fh.write(struct.pack(self.HEADER_FORMAT, self.FANGS_MAGIC, 0))
+        with open(self.filename, "wb") as fh:
+            fh.write(struct.pack(self.HEADER_FORMAT, self.MAGIC, bound))
+            written = 0  # bytes of the bitset already written
+            current_byte = 0
+            current_value = 0
+            for number, number_fangs in vampire_numbers_in_range(0, bound - 1, all_fangs=True):
+                byte_index = number >> 3
+                if byte_index != current_byte:
+                    fh.write(bytes([current_value]))
+                    written += 1
+                    self._write_zeros(fh, byte_index - written)
+                    written = byte_index
+                    current_byte = byte_index
+                    current_value = 0
+                current_value |= 1 << (number & 7)
+                if fangs_fh is not None:
+                    # the numbers are generated in increasing order, so the records are sorted
+                    for fang1, fang2 in number_fangs:
+                        fangs_fh.write(struct.pack(self.FANGS_RECORD_FORMAT, number, fang1, fang2))
+                    num_fangs += len(number_fangs)
+            if written < num_bytes:
+                fh.write(bytes([current_value]))
+                written += 1
+            self._write_zeros(fh, num_bytes - written)
+        if fangs_fh is not None:
+            fangs_fh.seek(0)
+            fangs_fh.write(struct.pack(self.HEADER_FORMAT, self.FANGS_MAGIC, num_fangs))
+            fangs_fh.close()
+        elif os.path.exists(self.fangs_filename):
+            os.remove(self.fangs_filename)
+
+    def _write_zeros(self, fh, amount):
+        """Write amount zero bytes in the file."""
+        while amount > 0:
+            size = min(amount, self.WRITE_BLOCK_SIZE)
+            fh.write(bytes(size))
+            amount -= size
+
+    def _load(self):
+        """Open the bitset with mmap, the first time the table is used."""
+        self._loaded = True
+        if not os.path.exists(self.filename):
+            return
+        fh = open(self.filename, "rb")
+        header = fh.read(self.HEADER_SIZE)
+        if len(header) != self.HEADER_SIZE:
+            fh.close()
+            return
+        magic, bound = struct.unpack(self.HEADER_FORMAT, header)
+        if magic != self.MAGIC or os.path.getsize(self.filename) < self.HEADER_SIZE + (bound + 7) // 8:
+            fh.close()
+            return
+        self._file = fh
+        self._bits = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self.bound = bound
+
+    def _load_fangs(self):
+        """Open the fangs side table with mmap, the first time a fang is looked up."""
+        self._fangs_loaded = True
+        if not os.path.exists(self.fangs_filename):
+            return
+        fh = open(self.fangs_filename, "rb")
+        header = fh.read(self.HEADER_SIZE)
+        if len(header) != self.HEADER_SIZE:
+            fh.close()
+            return
+        magic, num_fangs = struct.unpack(self.HEADER_FORMAT, header)
+        size = self.HEADER_SIZE + num_fangs * self.FANGS_RECORD_SIZE
+        if magic != self.FANGS_MAGIC or num_fangs == 0 or os.path.getsize(self.fangs_filename) < size:
+            fh.close()
+            return
+        self._fangs_file = fh
+        self._fangs = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self.num_fangs = num_fangs
+
+    def _fangs_record(self, position):
+        """Returns the (number, fang1, fang2) record of the fangs table at the position."""
+        offset = self.HEADER_SIZE + position * self.FANGS_RECORD_SIZE
+        return struct.unpack_from(self.FANGS_RECORD_FORMAT, self._fangs, offset)
+
+    def close(self):
+        """Close the table files, they will be opened again in the next lookup."""
+        if self._bits is not None:
+            self._bits.close()
+        if self._file is not None:
+            self._file.close()
+        if self._fangs is not None:
+            self._fangs.close()
+        if self._fangs_file is not None:
+            self._fangs_file.close()
+        self.bound = 0
+        self._loaded = False
+        self._file = None
+        self._bits = None
+        self._fangs_loaded = False
+        self._fangs_file = None
+        self._fangs = None
+        self.num_fangs = 0
+
+    def is_available(self):
+        """Returns True if the table file exists and is valid.
+
+        Returns:
+            bool: True if the table could be used.
+        """
+        if not self._loaded:
+            self._load()
+        return self._bits is not None
+
+    def contains(self, number):
+        """Returns True if the number is inside the range of the table.
+
+        Args:
+            number (int): the number.
+
+        Returns:
+            bool: True if the table has the answer for the number.
+        """
+        return self.is_available() and 0 <= number < self.bound
+
+    def is_vampire(self, number):
+        """Returns if the number is a vampire number according to the table.
+
+        Args:
+            number (int): the number to look up.
+
+        Returns:
+            bool|None: True or False, or None if the number is outside of the table.
+        """
+        if not self.contains(number):
+            return None
+        byte = self._bits[self.HEADER_SIZE + (number >> 3)]
+        return bool(byte >> (number & 7) & 1)
+
+    def fangs(self, number):
+        """Returns all the fangs of the number from the side table.
+
+        Args:
+            number (int): the number to look up.
+
+        Returns:
+            list|None: a list of pairs of fangs, or None if it's not in the side table.
+        """
+        if not self._fangs_loaded:
+            self._load_fangs()
+        if self._fangs is None:
+            return None
+        position = bisect_left(range(self.num_fangs), number, key=lambda i: self._fangs_record(i)[0])
+        fangs = []
+        while position < self.num_fangs:
+            record_number, fang1, fang2 = self._fangs_record(position)
+            if record_number != number:
+                break
+            fangs.append([fang1, fang2])
+            position += 1
+        return fangs or None
+
+
+if __name__ == "__main__":
+    import sys
+
+    def main():
+        bound = 10**8
+        if len(sys.argv) > 1:
+            bound = int(sys.argv[1])
+        table = VampireTable()
+        table.build(bound)
+        print(f"Vampire table built up to {bound} in {table.filename}")
+
+    main()